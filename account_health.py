@@ -0,0 +1,99 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from mailtm import BASE_URL, authenticate, send
+import account_store
+
+STATUSES = ("valid", "bad_credentials", "deleted", "disabled", "error")
+# Accounts checked at the same time; the shared rate limiter paces the calls
+HEALTH_WORKERS = 4
+# A stored status older than this is shown as stale and re-checked
+HEALTH_TTL = 6 * 3600
+
+def check_account(address, password):
+    """
+    Authenticate `address` and read GET /me. Returns a dict with status
+    (one of STATUSES), quota, used and detail. Never raises for API
+    failures; they come back as status "error". An account without a
+    password is reported as bad_credentials without calling the API.
+    The token issued for the check is not written to the token store, so
+    a sweep over many accounts does not rewrite it once per account.
+    """
+    if not password:
+        return {"status": "bad_credentials", "quota": None, "used": None, "detail": "no password stored"}
+    try:
+        token = authenticate(address, password)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code == 401:
+            return {"status": "bad_credentials", "quota": None, "used": None, "detail": "401 on /token"}
+        return {"status": "error", "quota": None, "used": None, "detail": str(e)}
+    except requests.exceptions.RequestException as e:
+        return {"status": "error", "quota": None, "used": None, "detail": type(e).__name__}
+
+    try:
+        response = send("GET", f"{BASE_URL}/me", headers={"Authorization": f"Bearer {token}"})
+    except requests.exceptions.RequestException as e:
+        return {"status": "error", "quota": None, "used": None, "detail": type(e).__name__}
+    if response.status_code == 404:
+        return {"status": "deleted", "quota": None, "used": None, "detail": "404 on /me"}
+    if response.status_code != 200:
+        return {"status": "error", "quota": None, "used": None, "detail": f"{response.status_code} on /me"}
+    me = response.json()
+    status = "deleted" if me.get("isDeleted") else "disabled" if me.get("isDisabled") else "valid"
+    return {"status": status, "quota": me.get("quota"), "used": me.get("used"), "detail": None}
+
+def is_stale(health, now=None):
+    """True if a stored health row is missing or older than HEALTH_TTL."""
+    return health is None or (now or time.time()) - health["checked_at"] > HEALTH_TTL
+
+def check_accounts(accounts, workers=HEALTH_WORKERS, on_result=None, stop=None):
+    """
+    Check `accounts` (dicts with address and password) concurrently and
+    store every result in the account store. on_result(address, result)
+    is called as each one finishes. Setting the `stop` Event drops the
+    checks that have not started. Returns {address: result}.
+    """
+    def check(account):
+        if stop is not None and stop.is_set():
+            return None
+        result = check_account(account["address"], account["password"])
+        account_store.set_health(account["address"], **result)
+        return result
+
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {executor.submit(check, a): a["address"] for a in accounts}
+        for future in as_completed(futures):
+            result = future.result()
+            if result is None:
+                continue
+            results[futures[future]] = result
+            if on_result:
+                on_result(futures[future], result)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+def start_background_refresh(accounts, on_done=None):
+    """
+    Re-check the stale ones among `accounts` on a daemon thread.
+    on_done(results) runs on that thread when anything was checked.
+    Returns a cancel() callable; results already stored are kept.
+    """
+    health = account_store.get_health(a["address"] for a in accounts)
+    stale = [a for a in accounts if is_stale(health.get(a["address"].lower()))]
+    stop = threading.Event()
+    if not stale:
+        return stop.set
+
+    def run():
+        results = check_accounts(stale, stop=stop)
+        if results and on_done and not stop.is_set():
+            on_done(results)
+
+    threading.Thread(target=run, name="health-refresh", daemon=True).start()
+    return stop.set
@@ -0,0 +1,200 @@
+import os
+import sqlite3
+import threading
+import time
+
+ACCOUNT_DB = "accounts.db"
+# Flat `email | password` file used before the account store existed
+LEGACY_ACCOUNTS_FILE = "accounts.txt"
+
+_conn = None
+_lock = threading.Lock()
+# count_accounts() results by prefix, dropped whenever accounts are added
+_counts = {}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    address    TEXT PRIMARY KEY COLLATE NOCASE,
+    password   TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+DROP INDEX IF EXISTS idx_accounts_created;
+CREATE INDEX IF NOT EXISTS idx_accounts_created_address ON accounts (created_at, address);
+CREATE TABLE IF NOT EXISTS health (
+    address    TEXT PRIMARY KEY COLLATE NOCASE,
+    status     TEXT NOT NULL,
+    quota      INTEGER,
+    used       INTEGER,
+    detail     TEXT,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _db():
+    """Open ACCOUNT_DB once per process, creating and migrating it if needed."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(ACCOUNT_DB, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+        _conn.executescript(SCHEMA)
+        _migrate_legacy_file(_conn)
+    return _conn
+
+def _migrate_legacy_file(db):
+    """
+    Import LEGACY_ACCOUNTS_FILE once. Line order is kept as creation
+    order, anchored at the file's modification time.
+    """
+    if db.execute("SELECT 1 FROM meta WHERE key = 'legacy_migrated'").fetchone():
+        return
+    try:
+        with open(LEGACY_ACCOUNTS_FILE, "r") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        base = os.path.getmtime(LEGACY_ACCOUNTS_FILE) - len(lines)
+    except FileNotFoundError:
+        lines = []
+        base = time.time()
+    rows = []
+    for offset, line in enumerate(lines):
+        address, _, password = line.partition(" | ")
+        if address and password:
+            rows.append((address.strip(), password.strip(), base + offset))
+    db.executemany(
+        "INSERT OR IGNORE INTO accounts (address, password, created_at) VALUES (?, ?, ?)",
+        rows
+    )
+    db.execute("INSERT INTO meta (key, value) VALUES ('legacy_migrated', ?)", (str(len(rows)),))
+    db.commit()
+
+def add_account(address, password):
+    """Store a newly created account."""
+    with _lock:
+        db = _db()
+        db.execute(
+            "INSERT OR REPLACE INTO accounts (address, password, created_at) VALUES (?, ?, ?)",
+            (address, password, time.time())
+        )
+        db.commit()
+        _counts.clear()
+
+def get_account(address):
+    """Return the account row for `address` as a dict, or None."""
+    with _lock:
+        row = _db().execute("SELECT * FROM accounts WHERE address = ?", (address,)).fetchone()
+    return dict(row) if row else None
+
+def get_password(address):
+    """Return the stored password for `address`, or None."""
+    account = get_account(address)
+    return account["password"] if account else None
+
+def _prefix_range(prefix):
+    """SQL condition and bounds matching addresses that start with `prefix` via the index."""
+    if not prefix:
+        return "1", ()
+    return "address >= ? AND address < ?", (prefix, prefix + "\uffff")
+
+def count_accounts(prefix=""):
+    """
+    Return the number of stored accounts, optionally only those starting
+    with `prefix`. Counts are cached until the next add_account().
+    """
+    with _lock:
+        if prefix not in _counts:
+            where, args = _prefix_range(prefix)
+            _counts[prefix] = _db().execute(f"SELECT COUNT(*) FROM accounts WHERE {where}", args).fetchone()[0]
+        return _counts[prefix]
+
+def _sort_columns(prefix):
+    """Listing order: creation order, or address order when filtering by prefix."""
+    return ("address",) if prefix else ("created_at", "address")
+
+def sort_key(account, prefix=""):
+    """The position of an account row in the listing, for page_from()."""
+    return tuple(account[column] for column in _sort_columns(prefix))
+
+def page_accounts(offset, limit, prefix="", from_end=False):
+    """
+    Return one page of accounts as dicts. Without a prefix the page is
+    taken in creation order, with one it is taken in address order. With
+    `from_end`, `offset` counts back from the last account; the page is
+    still returned in listing order.
+    """
+    where, args = _prefix_range(prefix)
+    order = ", ".join(c + (" DESC" if from_end else "") for c in _sort_columns(prefix))
+    # Skip `offset` entries on the index alone, then fetch only the page rows
+    with _lock:
+        rows = _db().execute(
+            f"SELECT * FROM accounts WHERE rowid IN ("
+            f"SELECT rowid FROM accounts WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?"
+            f") ORDER BY {order}",
+            (*args, limit, offset)
+        ).fetchall()
+    rows = [dict(row) for row in rows]
+    return rows[::-1] if from_end else rows
+
+def page_from(key, limit, prefix="", backward=False, inclusive=False):
+    """
+    Keyset paging: return up to `limit` accounts right after the sort_key()
+    `key` in listing order, or right before it when `backward`, walking the
+    index from there like iter_accounts(), so deep pages cost the same as
+    the first. A None key starts at the first (backward: the last) account.
+    Rows come back in listing order.
+    """
+    columns = _sort_columns(prefix)
+    where, args = _prefix_range(prefix)
+    if key is not None:
+        op = ("<" if backward else ">") + ("=" if inclusive else "")
+        where += f" AND ({', '.join(columns)}) {op} ({', '.join('?' * len(columns))})"
+        args = (*args, *key)
+    order = ", ".join(c + (" DESC" if backward else "") for c in columns)
+    with _lock:
+        rows = _db().execute(
+            f"SELECT * FROM accounts WHERE {where} ORDER BY {order} LIMIT ?",
+            (*args, limit)
+        ).fetchall()
+    rows = [dict(row) for row in rows]
+    return rows[::-1] if backward else rows
+
+def iter_accounts(batch_size=500):
+    """Yield account dicts in creation order, reading `batch_size` rows at a time."""
+    last = (-1.0, "")
+    while True:
+        with _lock:
+            rows = _db().execute(
+                "SELECT * FROM accounts WHERE (created_at, address) > (?, ?) "
+                "ORDER BY created_at, address LIMIT ?",
+                (*last, batch_size)
+            ).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(row)
+        last = (rows[-1]["created_at"], rows[-1]["address"])
+
+def set_health(address, status, quota=None, used=None, detail=None):
+    """Record the result of a health check of `address`, stamped with the current time."""
+    with _lock:
+        db = _db()
+        db.execute(
+            "INSERT OR REPLACE INTO health (address, status, quota, used, detail, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (address, status, quota, used, detail, time.time())
+        )
+        db.commit()
+
+def get_health(addresses):
+    """Return {lowercased address: health row dict} for those of `addresses` checked so far."""
+    addresses = list(addresses)
+    if not addresses:
+        return {}
+    placeholders = ",".join("?" * len(addresses))
+    with _lock:
+        rows = _db().execute(
+            f"SELECT * FROM health WHERE address IN ({placeholders})", addresses
+        ).fetchall()
+    return {row["address"].lower(): dict(row) for row in rows}
@@ -0,0 +1,105 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from mailtm import BASE_URL, request
+
+# Bytes read from the socket and written to disk per step; memory use per
+# download stays at about one chunk regardless of attachment size
+CHUNK_SIZE = 64 * 1024
+# Attachments of one message downloaded at the same time
+MAX_PARALLEL = 3
+# Default download folder, one sub-folder per message
+DOWNLOAD_DIR = "attachments"
+# Suffix of a partial download; it is resumed with a Range request
+PART_SUFFIX = ".part"
+
+def safe_filename(name, fallback="attachment"):
+    """Strip directories and characters that are unsafe in file names."""
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", os.path.basename(name or "")).strip(" .")
+    return name or fallback
+
+def target_paths(attachments, dest_dir):
+    """Map each attachment id to a unique file path in `dest_dir`."""
+    paths, used = {}, set()
+    for att in attachments:
+        name = safe_filename(att.get("filename"), att.get("id") or "attachment")
+        if name.lower() in used:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}-{att.get('id')}{ext}"
+        used.add(name.lower())
+        paths[att.get("id")] = os.path.join(dest_dir, name)
+    return paths
+
+def download_attachment(token, attachment, path, on_progress=None):
+    """
+    Stream one attachment to `path` in CHUNK_SIZE pieces. Bytes land in
+    `path` + PART_SUFFIX first; an existing partial file is resumed with a
+    Range request, and the file is renamed into place once complete.
+    on_progress(received, total) is called after every chunk; `total` is
+    None when the server does not say. Returns the number of bytes fetched
+    over the network (0 if `path` already exists).
+    """
+    if os.path.exists(path):
+        size = os.path.getsize(path)
+        if on_progress:
+            on_progress(size, size)
+        return 0
+    part = path + PART_SUFFIX
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    headers = {"Authorization": f"Bearer {token}"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+
+    url = urljoin(BASE_URL + "/", attachment["downloadUrl"].lstrip("/"))
+    response = request("GET", url, headers=headers, stream=True)
+    fetched = 0
+    try:
+        if response.status_code == 416:
+            # Nothing left past `offset`: the partial file is already whole
+            os.replace(part, path)
+            return 0
+        response.raise_for_status()
+        if response.status_code != 206:
+            offset = 0  # Range ignored, the body is the whole file
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length else None
+        with open(part, "ab" if offset else "wb") as f:
+            received = offset
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                received += len(chunk)
+                fetched += len(chunk)
+                if on_progress:
+                    on_progress(received, total)
+    finally:
+        response.close()
+    if total is not None and received < total:
+        raise IOError(f"{os.path.basename(path)}: connection closed at {received} of {total} bytes")
+    os.replace(part, path)
+    return fetched
+
+def download_attachments(token, message_id, attachments, dest_dir=None,
+                         parallel=MAX_PARALLEL, on_progress=None):
+    """
+    Download every attachment of a message into dest_dir (default
+    DOWNLOAD_DIR/<message_id>), up to `parallel` at a time.
+    on_progress(attachment, received, total) reports per-file progress
+    from the worker threads. Returns a list of (attachment, path, error)
+    with error None for files that completed.
+    """
+    dest_dir = dest_dir or os.path.join(DOWNLOAD_DIR, message_id)
+    os.makedirs(dest_dir, exist_ok=True)
+    paths = target_paths(attachments, dest_dir)
+
+    def fetch(att):
+        report = (lambda received, total: on_progress(att, received, total)) if on_progress else None
+        try:
+            download_attachment(token, att, paths[att.get("id")], report)
+            return att, paths[att.get("id")], None
+        except Exception as e:
+            return att, paths[att.get("id")], e
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        return list(executor.map(fetch, attachments))
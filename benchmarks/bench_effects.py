@@ -0,0 +1,105 @@
+"""
+Per-frame CPU cost of the terminal effects, against the previous
+string-concatenation implementations kept here for comparison.
+
+Usage:
+    python benchmarks/bench_effects.py --frames 2000 --width 120
+
+Only frame construction is timed (process CPU time), nothing is written to
+the terminal, so the numbers are the cost each frame takes away from
+network work running in other threads.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from colors import Colors
+import effects
+
+
+def legacy_rain_frame(width):
+    chars = "01█▓▒░"
+    line = "".join(
+        random.choice(chars) if random.random() < 0.1 else " "
+        for _ in range(width)
+    )
+    return "".join(
+        f"{random.choice([Colors.GREEN, Colors.BRIGHT_GREEN, Colors.BRIGHT_WHITE])}{c}{Colors.RESET}"
+        if c != " " and random.random() < 0.3 else c
+        for c in line
+    )
+
+
+def legacy_glitch_text(text, intensity=0.1):
+    glitch_chars = "█▓▒░▄▀■□▪▫"
+    result = ""
+    for ch in text:
+        if ch != " " and random.random() < intensity:
+            result += f"{Colors.BRIGHT_RED}{random.choice(glitch_chars)}{Colors.RESET}"
+        else:
+            result += ch
+    return result
+
+
+def legacy_rainbow_text(text):
+    colors = [Colors.RED, Colors.YELLOW, Colors.GREEN, Colors.CYAN, Colors.BLUE, Colors.MAGENTA]
+    result = ""
+    for i, char in enumerate(text):
+        if char != " ":
+            result += colors[i % len(colors)] + char
+        else:
+            result += char
+    return result + Colors.RESET
+
+
+def new_rain_frame(width):
+    # Same body as matrix_rain_effect's render(), against the shared pool
+    if not effects._rain_pool:
+        effects._rain_pool.extend(random.choices(effects.RAIN_CELLS, cum_weights=effects.RAIN_WEIGHTS,
+                                                 k=effects.RAIN_POOL_SIZE))
+    offset = random.randrange(effects.RAIN_POOL_SIZE - width + 1)
+    return "\r" + "".join(effects._rain_pool[offset:offset + width])
+
+
+def uncached_rainbow_text(text):
+    return effects.rainbow_text.__wrapped__(text)
+
+
+def per_frame_us(func, arg, frames):
+    """CPU microseconds per call of func(arg), best of three rounds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.process_time()
+        for _ in range(frames):
+            func(arg)
+        best = min(best, time.process_time() - start)
+    return best / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame CPU cost of terminal effects")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=120)
+    args = parser.parse_args()
+
+    text = ("CYBERMAIL PRO " * (args.width // 14 + 1))[:args.width]
+    cases = [
+        ("matrix rain frame", legacy_rain_frame, new_rain_frame, args.width),
+        ("glitch_text", legacy_glitch_text, effects.glitch_text, text),
+        ("rainbow_text", legacy_rainbow_text, uncached_rainbow_text, text),
+        ("rainbow_text cached", legacy_rainbow_text, effects.rainbow_text, text),
+    ]
+    budget_us = 1e6 / effects.FRAME_RATE
+    print(f"{args.frames} frames, width {args.width}, frame budget {budget_us:.0f} us at {effects.FRAME_RATE} fps")
+    print(f"{'effect':<20} {'legacy us':>10} {'new us':>10} {'speedup':>8} {'% of frame':>10}")
+    for name, legacy, new, arg in cases:
+        old_us = per_frame_us(legacy, arg, args.frames)
+        new_us = per_frame_us(new, arg, args.frames)
+        print(f"{name:<20} {old_us:>10.1f} {new_us:>10.1f} {old_us / new_us:>7.1f}x {new_us / budget_us * 100:>9.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare mail.tm round-trips with bare requests calls against the shared
+pooled session from mailtm.py, using a local stand-in server.
+
+Usage:
+    python benchmarks/bench_session.py --requests 200 --connect-delay 0.03
+
+--connect-delay sleeps once per new TCP connection on the server side to
+stand in for the TCP+TLS handshake cost of the real api.mail.tm.
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mailtm import new_session
+import standin_server
+
+
+def run(get, url, token, count):
+    """Time `count` sequential GETs and return per-request latencies in ms."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        r = get(url, headers={"Authorization": f"Bearer {token}"})
+        r.raise_for_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(label, timings):
+    timings = sorted(timings)
+    mean = sum(timings) / len(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<12} n={len(timings):<5} mean={mean:7.2f} ms  p95={p95:7.2f} ms  total={sum(timings):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--connect-delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    # An empty inbox keeps the response small, so connection setup dominates
+    server = standin_server.start_server(connect_delay=args.connect_delay, messages=0)
+    token = server.store.token_for(server.store.create_account(f"bench@{server.store.options['domain']}", "bench"))
+    url = f"{server.base_url}/messages"
+    try:
+        summarize("bare", run(requests.get, url, token, args.requests))
+        session = new_session()
+        summarize("pooled", run(session.get, url, token, args.requests))
+        session.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Fail when cold-start import time of the entry points goes over budget.
+
+Usage:
+    python benchmarks/check_import_budget.py [--runs 5] [--scale 1.0]
+
+Each target is imported in a fresh interpreter `--runs` times and the
+fastest run is compared against IMPORT_BUDGET_MS. `--scale` multiplies
+every budget for slower machines. Exits 1 if any target is over budget.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from import_report import best_of, format_report
+
+# Milliseconds. `cli` must stay free of Rich and the animated UI; `main`
+# is allowed Rich's console but no command modules.
+IMPORT_BUDGET_MS = {
+    "cli": 60,
+    "main": 150,
+}
+
+# Modules that must never be imported by a target
+FORBIDDEN = {
+    "cli": ("rich", "effects", "ui", "requests"),
+    "main": ("commands", "requests"),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in IMPORT_BUDGET_MS.items():
+        report = best_of(module, args.runs)
+        budget *= args.scale
+        took = report["total_us"] / 1000
+        loaded = {name.split(".")[0] for name, _, _, _ in report["rows"]}
+        leaked = sorted(loaded & set(FORBIDDEN.get(module, ())))
+        ok = took <= budget and not leaked
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {module:<6} {took:7.1f} ms (budget {budget:.0f} ms)"
+              + (f" imports {', '.join(leaked)}" if leaked else ""))
+        if not ok:
+            print(format_report(report, top=10))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Repeatable benchmark suite against the local mail.tm stand-in.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--output results.json]
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --tolerance 0.25
+
+Cases:
+    cold_start          fresh interpreter: import main and render the menu frame
+    fetch_emails_N      page through an N-message inbox (10, 1k, 50k)
+    view_details_cold   view_email_details with an empty detail cache
+    view_details_warm   view_email_details served from the detail cache
+    accounts_page_*     render_accounts_page over 100k stored accounts
+
+Every case runs in a scratch directory with its own databases. Results
+are written as JSON. With --baseline, each case is compared to the saved
+best-of-N time and the run exits 1 if any case got slower by more than
+--tolerance (0.25 = 25%) and by at least --min-delta-ms.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import standin_server
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+INBOX_SIZES = (10, 1000, 50000)
+QUICK_INBOX_SIZES = (10, 1000, 5000)
+ACCOUNT_COUNT = 100000
+QUICK_ACCOUNT_COUNT = 10000
+
+
+def timed_runs(func, repeat):
+    """Run func() `repeat` times; return (median, min) wall time in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def bench_cold_start(repeat):
+    code = "import main, ui; ui.render_menu_frame(120)"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+    median, best = timed_runs(run, repeat)
+    return {"cold_start": {"ms": median, "min_ms": best}}
+
+
+def bench_fetch_emails(server, sizes, repeat):
+    from inbox import authenticate_email, fetch_emails
+    results = {}
+    for size in sizes:
+        address = f"bench{size}@{server.store.options['domain']}"
+        server.store.options["messages"] = size
+        token = authenticate_email(address, "bench")
+        count = [0]
+
+        def run():
+            count[0] = sum(1 for _ in fetch_emails(token))
+        median, best = timed_runs(run, repeat if size < 10000 else min(repeat, 3))
+        assert count[0] == size, f"fetched {count[0]} of {size}"
+        results[f"fetch_emails_{size}"] = {"ms": median, "min_ms": best,
+                                            "messages_per_s": size / (median / 1000)}
+    return results
+
+
+def bench_view_details(server, repeat):
+    import detail_cache
+    from inbox import authenticate_email, fetch_emails
+    from commands.login_accounts import view_email_details
+    server.store.options["messages"] = 50
+    token = authenticate_email(f"details@{server.store.options['domain']}", "bench")
+    ids = [m["id"] for m in fetch_emails(token)]
+    sink = io.StringIO()
+
+    def view(message_id):
+        sink.seek(0)
+        sink.truncate()
+        with contextlib.redirect_stdout(sink):
+            view_email_details(token, message_id)
+
+    def cold():
+        for message_id in ids:
+            detail_cache.discard(message_id)
+            view(message_id)
+
+    def warm():
+        for message_id in ids:
+            view(message_id)
+    cold_ms, cold_best = timed_runs(cold, repeat)
+    warm()
+    warm_ms, warm_best = timed_runs(warm, repeat)
+    return {
+        "view_details_cold": {"ms": cold_ms / len(ids), "min_ms": cold_best / len(ids)},
+        "view_details_warm": {"ms": warm_ms / len(ids), "min_ms": warm_best / len(ids)},
+    }
+
+
+def bench_accounts(count, repeat):
+    import account_store
+    from commands import view_accounts
+    db = account_store._db()
+    # Bulk insert straight into the store; add_account commits per row
+    with db:
+        db.executemany(
+            "INSERT OR IGNORE INTO accounts (address, password, created_at) VALUES (?, ?, ?)",
+            ((f"ginmail{i:06d}@bench.test", "pw", 1e9 + i) for i in range(count))
+        )
+    # The insert bypassed add_account, which is what drops cached counts
+    account_store._counts.clear()
+    view_accounts.clear_screen = lambda: None
+    pages = (count + view_accounts.PAGE_SIZE - 1) // view_accounts.PAGE_SIZE
+    results = {}
+    for name, page, prefix in (("first", 1, ""), ("middle", pages // 2, ""),
+                               ("last", pages, ""), ("prefix", 1, "ginmail05")):
+        with contextlib.redirect_stdout(io.StringIO()):
+            median, best = timed_runs(lambda: view_accounts.render_accounts_page(page, prefix), repeat)
+        results[f"accounts_page_{name}"] = {"ms": median, "min_ms": best}
+    # Paging on from the middle page, as the N key does
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, _, shown = view_accounts.render_accounts_page(pages // 2)
+        median, best = timed_runs(lambda: view_accounts.render_accounts_page(pages // 2 + 1, "", shown, pages // 2),
+                                  repeat)
+    results["accounts_page_next"] = {"ms": median, "min_ms": best}
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """
+    Print each case against the baseline and return the names that
+    regressed. Best-of-N times are compared; they are far less noisy than
+    medians on a shared machine.
+    """
+    regressed = []
+    print(f"\n{'case':<26} {'baseline ms':>12} {'now ms':>10} {'change':>8}")
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26} {'-':>12} {result['min_ms']:>10.2f} {'new':>8}")
+            continue
+        change = result["min_ms"] / base["min_ms"] - 1 if base["min_ms"] else 0.0
+        flag = ""
+        if change > tolerance and result["min_ms"] - base["min_ms"] > min_delta_ms:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26} {base['min_ms']:>12.2f} {result['min_ms']:>10.2f} {change:>+7.0%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smaller inboxes and account table")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help=f"compare against this results file (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="also write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many ms (sub-ms cases are noisy)")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in latency per call, seconds")
+    args = parser.parse_args()
+    # Paths are resolved before switching to the scratch directory
+    for name in ("output", "baseline", "save_baseline"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    server = standin_server.start_server(latency=args.latency, auto_accounts=True)
+    scratch = tempfile.mkdtemp(prefix="cybermail-bench-")
+    # App modules read the base URL at import and open their databases in the cwd
+    os.environ["MAILTM_BASE_URL"] = server.base_url
+    os.environ["MAILTM_MERCURE_URL"] = server.mercure_url
+    # The stand-in has no rate limit; client pacing would only measure itself
+    os.environ["MAILTM_RATE_LIMIT"] = "0"
+    os.chdir(scratch)
+
+    results = {}
+    try:
+        for label, run in (
+            ("cold start", lambda: bench_cold_start(args.repeat)),
+            ("fetch_emails", lambda: bench_fetch_emails(server, QUICK_INBOX_SIZES if args.quick else INBOX_SIZES,
+                                                        args.repeat)),
+            ("view_email_details", lambda: bench_view_details(server, args.repeat)),
+            ("account listing", lambda: bench_accounts(QUICK_ACCOUNT_COUNT if args.quick else ACCOUNT_COUNT,
+                                                       args.repeat)),
+        ):
+            print(f"running {label}...", file=sys.stderr)
+            results.update(run())
+    finally:
+        server.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+            "latency": args.latency,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    if not args.output and not args.save_baseline:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressed = compare(results, json.load(f)["results"], args.tolerance, args.min_delta_ms)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
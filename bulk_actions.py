@@ -0,0 +1,107 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+from mailtm import BASE_URL, request
+import message_cache
+import detail_cache
+
+ACTIONS = ("read", "delete")
+# Requests in flight at once; the shared rate limiter still paces them
+BULK_WORKERS = 8
+
+def parse_selection(text, count):
+    """
+    Turn "1-5,8" (1-based message numbers as shown in the inbox table)
+    into sorted 0-based indexes. Raises ValueError on bad input.
+    """
+    indexes = set()
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        first, _, last = part.partition("-")
+        start, end = int(first), int(last or first)
+        if not 1 <= start <= end <= count:
+            raise ValueError(f"{part} is outside 1-{count}")
+        indexes.update(range(start - 1, end))
+    return sorted(indexes)
+
+def select_messages(messages, seen=None, sender=None, subject=None, older_than_days=None):
+    """
+    Filter message summaries by rule: read state, sender substring,
+    subject regular expression (a string, matched case-insensitively, or
+    a compiled pattern) and minimum age in days. Rules left at None match
+    everything. Raises re.error for a bad subject expression.
+    """
+    pattern = re.compile(subject, re.IGNORECASE) if isinstance(subject, str) and subject else subject or None
+    cutoff = None
+    if older_than_days is not None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+    selected = []
+    for message in messages:
+        if seen is not None and bool(message.get("seen")) != seen:
+            continue
+        address = (message.get("from") or {}).get("address") or ""
+        if sender and sender.lower() not in address.lower():
+            continue
+        if pattern and not pattern.search(message.get("subject") or ""):
+            continue
+        if cutoff and (message.get("createdAt") or "") >= cutoff:
+            continue
+        selected.append(message)
+    return selected
+
+def apply_action(token, action, message_id):
+    """
+    PATCH one message to seen, or DELETE it. The token is sent per
+    request, so jobs for several accounts can share the session. A
+    delete of a message that is already gone counts as done.
+    """
+    url = f"{BASE_URL}/messages/{message_id}"
+    headers = {"Authorization": f"Bearer {token}"}
+    if action == "read":
+        headers["Content-Type"] = "application/merge-patch+json"
+        response = request("PATCH", url, headers=headers, data=json.dumps({"seen": True}), retry_5xx=True)
+    elif action == "delete":
+        response = request("DELETE", url, headers=headers)
+        if response.status_code == 404:
+            return
+    else:
+        raise ValueError(f"unknown bulk action: {action}")
+    response.raise_for_status()
+
+def run(jobs, action, workers=BULK_WORKERS, on_progress=None):
+    """
+    Apply `action` to every (account, token, message_id) in `jobs` on a
+    pool of `workers` threads, then update the local cache in one batch
+    per account. on_progress(done, failed, total) is called as results
+    come in. Returns (done, failures): done maps account -> list of
+    message ids, failures is a list of (account, message_id, error).
+    """
+    jobs = list(jobs)
+    done, failures = {}, []
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {executor.submit(apply_action, token, action, message_id): (account, message_id)
+                   for account, token, message_id in jobs}
+        finished = 0
+        for future in as_completed(futures):
+            account, message_id = futures[future]
+            try:
+                future.result()
+                done.setdefault(account, []).append(message_id)
+                finished += 1
+            except Exception as e:
+                failures.append((account, message_id, e))
+            if on_progress:
+                on_progress(finished, len(failures), len(jobs))
+    finally:
+        # On Ctrl+C, drop queued jobs and still record what already went through
+        executor.shutdown(wait=True, cancel_futures=True)
+        for account, ids in done.items():
+            if action == "read":
+                message_cache.mark_seen_many(account, ids)
+            else:
+                message_cache.forget_messages(account, ids)
+                for message_id in ids:
+                    detail_cache.discard(message_id)
+    return done, failures
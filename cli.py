@@ -0,0 +1,411 @@
+"""
+Headless command line for scripts and CI.
+
+    python main.py list-accounts [--search PREFIX] [--limit N] [--json]
+    python main.py inbox ADDRESS [--cached] [--limit N] [--json]
+    python main.py show-message ADDRESS MESSAGE_ID|latest [--json]
+    python main.py wait-for-message ADDRESS [--sender TEXT] [--subject REGEX] [--timeout S] [--json]
+    python main.py export ADDRESS [--format jsonl|mbox|maildir] [--output PATH] [--full] [--parallel N]
+    python main.py export-all [--format mbox|maildir] [--dir DIR] [--parallel N]
+    python main.py cleanup read|delete [ADDRESS ...] [--all-accounts] [--read|--unread] [--sender TEXT]
+                           [--subject REGEX] [--older-than DAYS] [--parallel N] [--dry-run] [--json]
+    python main.py check-accounts [ADDRESS ...] [--stale-only] [--json]
+    python main.py download-attachments ADDRESS MESSAGE_ID|latest [--dir DIR] [--parallel N] [--json]
+    python main.py import-report [MODULE] [--top N] [--json]
+
+--metrics FILE writes per-endpoint API metrics (Prometheus text, or JSON
+for *.json) when the command finishes.
+
+Never imports the animated UI (effects, ui, Rich). Exit codes: 0 success,
+1 nothing found / timed out, 2 usage error, 3 authentication or API error.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import account_store
+import message_cache
+
+EXIT_OK = 0
+EXIT_NOT_FOUND = 1
+EXIT_API_ERROR = 3
+
+class CliError(Exception):
+    """An error reported on stderr with a specific exit code."""
+    def __init__(self, message, code=EXIT_API_ERROR):
+        super().__init__(message)
+        self.code = code
+
+def _emit(args, rows, columns):
+    """Print `rows` (dicts) as JSON lines or as tab-separated columns."""
+    for row in rows:
+        if args.json:
+            print(json.dumps(row, ensure_ascii=False))
+        else:
+            print("\t".join(str(row.get(c, "")) for c in columns))
+
+def _regex(text, flags=0):
+    """
+    argparse type for regular expressions. re.error is not a ValueError,
+    so a plain type=re.compile would crash instead of exiting with 2.
+    """
+    try:
+        return re.compile(text, flags)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(f"invalid regular expression {text!r}: {e}")
+
+def _summary(message):
+    """Flatten a mail.tm message into the fields scripts care about."""
+    sender = message.get("from") or {}
+    return {
+        "id": message.get("id"),
+        "createdAt": message.get("createdAt"),
+        "from": sender.get("address"),
+        "subject": message.get("subject"),
+        "seen": bool(message.get("seen")),
+    }
+
+def _sign_in(address, password=None):
+    """Return a token for `address` using --password, $CYBERMAIL_PASSWORD or the account store."""
+    from inbox import authenticate_email
+    password = password or os.environ.get("CYBERMAIL_PASSWORD") or account_store.get_password(address)
+    try:
+        token = authenticate_email(address, password)
+    except Exception as e:
+        raise CliError(str(e))
+    if not token:
+        raise CliError(f"No password or cached token for {address}")
+    return token
+
+def cmd_list_accounts(args):
+    accounts = account_store.page_accounts(0, args.limit, args.search)
+    _emit(args, ({"address": a["address"], "password": a["password"]} for a in accounts),
+          ("address", "password"))
+    return EXIT_OK if accounts else EXIT_NOT_FOUND
+
+def cmd_inbox(args):
+    if not args.cached:
+        from inbox import sync_inbox
+        token = _sign_in(args.address, args.password)
+        try:
+            sync_inbox(token, args.address)
+        except Exception as e:
+            raise CliError(str(e))
+    messages = message_cache.cached_messages(args.address)[:args.limit]
+    _emit(args, (_summary(m) for m in messages), ("id", "createdAt", "from", "subject"))
+    return EXIT_OK if messages else EXIT_NOT_FOUND
+
+def cmd_show_message(args):
+    from inbox import get_message_details, sync_inbox
+    token = _sign_in(args.address, args.password)
+    message_id = args.message_id
+    if message_id == "latest":
+        try:
+            sync_inbox(token, args.address)
+        except Exception as e:
+            raise CliError(str(e))
+        cached = message_cache.cached_messages(args.address)
+        if not cached:
+            return EXIT_NOT_FOUND
+        message_id = cached[0]["id"]
+    details = get_message_details(token, message_id)
+    if details is None:
+        raise CliError(f"Message {message_id} not found", EXIT_NOT_FOUND)
+    if args.json:
+        print(json.dumps(details, ensure_ascii=False))
+    else:
+        summary = _summary(details)
+        print(f"From: {summary['from']}")
+        print(f"Date: {summary['createdAt']}")
+        print(f"Subject: {summary['subject']}")
+        print()
+        from html_text import message_text
+        print(message_text(details))
+    return EXIT_OK
+
+def cmd_wait_for_message(args):
+    from inbox import sync_inbox
+    token = _sign_in(args.address, args.password)
+    subject = args.subject
+    # Only mail arriving after the call counts
+    try:
+        sync_inbox(token, args.address)
+    except Exception as e:
+        raise CliError(str(e))
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        time.sleep(min(args.interval, max(0, deadline - time.monotonic())))
+        try:
+            new_ids = sync_inbox(token, args.address)
+        except Exception as e:
+            raise CliError(str(e))
+        for message in message_cache.cached_messages(args.address):
+            if message["id"] not in new_ids:
+                continue
+            summary = _summary(message)
+            if args.sender and args.sender.lower() not in (summary["from"] or "").lower():
+                continue
+            if subject and not subject.search(summary["subject"] or ""):
+                continue
+            _emit(args, [summary], ("id", "createdAt", "from", "subject"))
+            return EXIT_OK
+    return EXIT_NOT_FOUND
+
+def _report_export(address, exported, skipped, failures):
+    print(f"{address}: exported {exported} messages, {skipped} already in the checkpoint", file=sys.stderr)
+    for message, error in failures:
+        print(f"{address}: {message.get('id')}: {error}", file=sys.stderr)
+
+def cmd_export(args):
+    from inbox import fetch_emails, get_message_details
+    token = _sign_in(args.address, args.password)
+    if args.format != "jsonl":
+        import mail_export
+        target = args.output or mail_export.account_target(args.address, args.format)
+        try:
+            exported, skipped, failures = mail_export.export_account(token, target, args.format, args.parallel)
+        except Exception as e:
+            raise CliError(str(e))
+        _report_export(args.address, exported, skipped, failures)
+        print(target)
+        return EXIT_API_ERROR if failures else EXIT_OK
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    try:
+        for message in fetch_emails(token):
+            record = get_message_details(token, message["id"]) if args.full else message
+            out.write(json.dumps(record or message, ensure_ascii=False) + "\n")
+            count += 1
+    except Exception as e:
+        raise CliError(str(e))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"exported {count} messages", file=sys.stderr)
+    return EXIT_OK
+
+def cmd_cleanup(args):
+    import bulk_actions
+    from inbox import sync_inbox
+    if args.all_accounts:
+        addresses = [a["address"] for a in account_store.iter_accounts()]
+    else:
+        addresses = args.addresses
+    if not addresses:
+        raise CliError("give one or more addresses, or --all-accounts", 2)
+    seen = True if args.read else False if args.unread else None
+    jobs = []
+    for address in addresses:
+        token = _sign_in(address, args.password)
+        try:
+            sync_inbox(token, address)
+        except Exception as e:
+            raise CliError(f"{address}: {e}")
+        selected = bulk_actions.select_messages(message_cache.cached_messages(address), seen, args.sender,
+                                                args.subject, args.older_than)
+        if args.dry_run:
+            _emit(args, (dict(_summary(m), account=address) for m in selected),
+                  ("account", "id", "createdAt", "from", "subject"))
+        jobs.extend((address, token, m["id"]) for m in selected)
+    if args.dry_run or not jobs:
+        return EXIT_OK if jobs else EXIT_NOT_FOUND
+
+    started = time.monotonic()
+    done, failures = bulk_actions.run(jobs, args.action, args.parallel)
+    for address, message_id, error in failures:
+        _emit(args, [{"account": address, "id": message_id, "error": str(error)}], ("account", "id", "error"))
+    count = sum(len(ids) for ids in done.values())
+    print(f"{args.action}: {count} of {len(jobs)} messages in {time.monotonic() - started:.1f}s, "
+          f"{len(failures)} failed", file=sys.stderr)
+    return EXIT_API_ERROR if failures else EXIT_OK
+
+def cmd_check_accounts(args):
+    import account_health
+    if args.addresses:
+        accounts = []
+        for address in args.addresses:
+            account = account_store.get_account(address)
+            if account is None:
+                raise CliError(f"{address} is not in the account store", EXIT_NOT_FOUND)
+            accounts.append(account)
+    else:
+        accounts = account_store.iter_accounts()
+    if args.stale_only:
+        accounts = list(accounts)
+        health = account_store.get_health(a["address"] for a in accounts)
+        accounts = [a for a in accounts if account_health.is_stale(health.get(a["address"].lower()))]
+    results = account_health.check_accounts(accounts, args.parallel)
+    _emit(args, ({"address": address, **result} for address, result in results.items()),
+          ("address", "status", "used", "quota", "detail"))
+    if not results:
+        return EXIT_NOT_FOUND
+    return EXIT_OK if all(r["status"] == "valid" for r in results.values()) else EXIT_API_ERROR
+
+def cmd_download_attachments(args):
+    import threading
+    import attachments
+    from inbox import get_message_details, sync_inbox
+    token = _sign_in(args.address, args.password)
+    message_id = args.message_id
+    if message_id == "latest":
+        try:
+            sync_inbox(token, args.address)
+        except Exception as e:
+            raise CliError(str(e))
+        cached = message_cache.cached_messages(args.address)
+        if not cached:
+            return EXIT_NOT_FOUND
+        message_id = cached[0]["id"]
+    details = get_message_details(token, message_id)
+    if details is None:
+        raise CliError(f"Message {message_id} not found", EXIT_NOT_FOUND)
+    files = details.get("attachments") or []
+    if not files:
+        return EXIT_NOT_FOUND
+
+    # Per-file progress on stderr at each quarter, so stdout stays parseable
+    reported = {}
+    lock = threading.Lock()
+
+    def on_progress(att, received, total):
+        quarter = received * 4 // total if total else 0
+        with lock:
+            if quarter > reported.get(att["id"], 0):
+                reported[att["id"]] = quarter
+                print(f"{att.get('filename')}: {quarter * 25}% ({received}/{total} bytes)", file=sys.stderr)
+
+    results = attachments.download_attachments(token, message_id, files, args.dir, args.parallel, on_progress)
+    failed = 0
+    for att, path, error in results:
+        failed += error is not None
+        row = {"id": att.get("id"), "filename": att.get("filename"), "path": path,
+               "error": str(error) if error else None}
+        _emit(args, [row], ("path",) if error is None else ("filename", "error"))
+    return EXIT_API_ERROR if failed else EXIT_OK
+
+def cmd_export_all(args):
+    import mail_export
+    results = mail_export.export_all(args.format, args.dir, args.parallel,
+                                     on_account=lambda address, target: print(target))
+    if not results:
+        return EXIT_NOT_FOUND
+    failed = False
+    for address, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{address}: {result}", file=sys.stderr)
+            failed = True
+        else:
+            _report_export(address, *result)
+            failed = failed or bool(result[2])
+    return EXIT_API_ERROR if failed else EXIT_OK
+
+def cmd_import_report(args):
+    import import_report
+    modules = [args.module] if args.module else import_report.TARGETS
+    for module in modules:
+        try:
+            report = import_report.measure(module)
+        except RuntimeError as e:
+            raise CliError(f"import {module} failed: {e}")
+        if args.json:
+            print(json.dumps({"module": module, "total_us": report["total_us"],
+                              "packages": dict(import_report.by_package(report)[:args.top])}))
+        else:
+            print(import_report.format_report(report, args.top))
+    return EXIT_OK
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cybermail", description="Headless CyberMail Pro commands")
+    parser.add_argument("--metrics", metavar="FILE", help="write API metrics here on exit (.json or Prometheus text)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, func, help_text, address=True):
+        p = sub.add_parser(name, help=help_text)
+        if address:
+            p.add_argument("address")
+            p.add_argument("--password", help="defaults to $CYBERMAIL_PASSWORD or the stored password")
+        p.add_argument("--json", action="store_true", help="print JSON lines instead of tab-separated text")
+        p.set_defaults(func=func)
+        return p
+
+    p = add("list-accounts", cmd_list_accounts, "list stored accounts", address=False)
+    p.add_argument("--search", default="", help="address prefix")
+    p.add_argument("--limit", type=int, default=1000)
+
+    p = add("inbox", cmd_inbox, "sync and list an inbox, newest first")
+    p.add_argument("--cached", action="store_true", help="list the local cache without calling the API")
+    p.add_argument("--limit", type=int, default=50)
+
+    p = add("show-message", cmd_show_message, "print one message")
+    p.add_argument("message_id", help="message id, or 'latest'")
+
+    p = add("wait-for-message", cmd_wait_for_message, "block until a matching message arrives")
+    p.add_argument("--sender", help="substring of the sender address")
+    p.add_argument("--subject", type=_regex, help="regular expression matched against the subject")
+    p.add_argument("--timeout", type=float, default=60)
+    p.add_argument("--interval", type=float, default=3)
+
+    p = add("export", cmd_export, "dump every message as JSON lines, or archive raw sources to mbox/Maildir")
+    p.add_argument("--format", choices=("jsonl", "mbox", "maildir"), default="jsonl")
+    p.add_argument("--output", "-o", help="file or Maildir folder to write (default stdout for jsonl, "
+                                          "exports/ADDRESS otherwise); mbox/Maildir exports resume from "
+                                          "PATH.checkpoint")
+    p.add_argument("--full", action="store_true", help="jsonl: fetch full message details, not just summaries")
+    p.add_argument("--parallel", type=int, default=4, help="mbox/maildir: sources downloaded at once")
+
+    p = add("export-all", cmd_export_all, "archive every stored account to exports/", address=False)
+    p.add_argument("--format", choices=("mbox", "maildir"), default="mbox")
+    p.add_argument("--dir", default="exports", help="folder for the per-account archives")
+    p.add_argument("--parallel", type=int, default=4, help="sources downloaded at once")
+
+    p = add("cleanup", cmd_cleanup, "mark read or delete matching messages in bulk", address=False)
+    p.add_argument("action", choices=("read", "delete"))
+    p.add_argument("addresses", nargs="*", metavar="ADDRESS")
+    p.add_argument("--all-accounts", action="store_true", help="every stored account")
+    p.add_argument("--password", help="defaults to $CYBERMAIL_PASSWORD or the stored password")
+    state = p.add_mutually_exclusive_group()
+    state.add_argument("--read", action="store_true", help="only messages already read")
+    state.add_argument("--unread", action="store_true", help="only unread messages")
+    p.add_argument("--sender", help="substring of the sender address")
+    p.add_argument("--subject", type=lambda text: _regex(text, re.IGNORECASE),
+                   help="regular expression matched against the subject, ignoring case")
+    p.add_argument("--older-than", type=float, metavar="DAYS")
+    p.add_argument("--parallel", type=int, default=8, help="requests in flight at once")
+    p.add_argument("--dry-run", action="store_true", help="list the matching messages and change nothing")
+
+    p = add("check-accounts", cmd_check_accounts, "verify stored accounts and record their status",
+            address=False)
+    p.add_argument("addresses", nargs="*", metavar="ADDRESS", help="default: every stored account")
+    p.add_argument("--stale-only", action="store_true", help="skip accounts checked recently")
+    p.add_argument("--parallel", type=int, default=4, help="accounts checked at once")
+
+    p = add("download-attachments", cmd_download_attachments, "download a message's attachments")
+    p.add_argument("message_id", help="message id, or 'latest'")
+    p.add_argument("--dir", help="target folder (default attachments/MESSAGE_ID); partial files are resumed")
+    p.add_argument("--parallel", type=int, default=3, help="files downloaded at once")
+
+    p = add("import-report", cmd_import_report, "show the cold-start import time breakdown", address=False)
+    p.add_argument("module", nargs="?", help="module to time (default: cli and main)")
+    p.add_argument("--top", type=int, default=15, help="packages to list")
+    return parser
+
+def main(argv=None):
+    """Parse `argv`, run one subcommand and return its exit code."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return e.code
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.metrics:
+            import metrics
+            metrics.export(args.metrics)
+
+if __name__ == "__main__":
+    sys.exit(main())
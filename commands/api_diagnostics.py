@@ -0,0 +1,64 @@
+from colors import Colors
+from effects import clear_screen
+from ui import cyberpunk_header, cyberpunk_input_prompt
+import metrics
+
+# Default export paths; the extension picks the format
+PROMETHEUS_FILE = "metrics.prom"
+JSON_FILE = "metrics.json"
+
+def _format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+def render_diagnostics():
+    """
+    Draw per-endpoint call counts, latency percentiles, errors, retries,
+    rate-limit waits and traffic.
+    """
+    clear_screen()
+    cyberpunk_header("API DIAGNOSTICS", Colors.BRIGHT_CYAN)
+    rows = metrics.snapshot()
+    if not rows:
+        print(f"\n{Colors.BRIGHT_YELLOW}[IDLE]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}No API calls recorded in this session yet{Colors.RESET}")
+        return
+
+    print(f"\n{Colors.BRIGHT_WHITE}{'METHOD':<7} {'ENDPOINT':<22} {'CALLS':>6} {'P50 ms':>8} {'P95 ms':>8} "
+          f"{'ERR':>5} {'RETRY':>5} {'WAIT s':>7} {'IN':>8} {'OUT':>8}  STATUS{Colors.RESET}")
+    print(f"{Colors.BRIGHT_BLACK}{'-'*108}{Colors.RESET}")
+    for r in rows:
+        err_col = Colors.BRIGHT_RED if r["errors"] else Colors.BRIGHT_GREEN
+        statuses = " ".join(f"{status}:{n}" for status, n in sorted(r["statuses"].items()))
+        print(f"{Colors.BRIGHT_MAGENTA}{r['method']:<7}{Colors.RESET} {Colors.BRIGHT_CYAN}{r['endpoint'][:22]:<22}{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}{r['count']:>6}{Colors.RESET} "
+              f"{Colors.BRIGHT_YELLOW}{r['p50'] * 1000:>8.0f} {r['p95'] * 1000:>8.0f}{Colors.RESET} "
+              f"{err_col}{r['errors']:>5}{Colors.RESET} {Colors.BRIGHT_YELLOW}{r['retries']:>5}{Colors.RESET} "
+              f"{Colors.BRIGHT_YELLOW}{r['throttled_seconds']:>7.1f}{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}{_format_bytes(r['bytes_in']):>8} {_format_bytes(r['bytes_out']):>8}{Colors.RESET}  "
+              f"{Colors.BRIGHT_BLACK}{statuses}{Colors.RESET}")
+
+def api_diagnostics_menu():
+    """
+    Show latency, status and traffic metrics for every mail.tm endpoint
+    called in this session, with Prometheus/JSON export.
+    """
+    while True:
+        render_diagnostics()
+        print(f"\n  {Colors.BRIGHT_GREEN}[R]{Colors.RESET} Refresh  "
+              f"{Colors.BRIGHT_GREEN}[E]{Colors.RESET} Export {PROMETHEUS_FILE}  "
+              f"{Colors.BRIGHT_GREEN}[J]{Colors.RESET} Export {JSON_FILE}  "
+              f"{Colors.BRIGHT_GREEN}[C]{Colors.RESET} Clear  "
+              f"{Colors.BRIGHT_GREEN}[B]{Colors.RESET} Back")
+        action = cyberpunk_input_prompt("SELECT ACTION", Colors.BRIGHT_YELLOW).strip().upper()
+        if action in ('E', 'J'):
+            path = metrics.export(PROMETHEUS_FILE if action == 'E' else JSON_FILE)
+            print(f"\n{Colors.BRIGHT_GREEN}[EXPORTED]{Colors.RESET} {Colors.BRIGHT_WHITE}{path}{Colors.RESET}")
+            cyberpunk_input_prompt("Press Enter to continue", Colors.BRIGHT_GREEN)
+        elif action == 'C':
+            metrics.reset()
+        elif action == 'B':
+            return
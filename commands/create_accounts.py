@@ -1,3 +1,4 @@
+import os
 import requests
 import random
 import string
@@ -6,17 +7,25 @@ import time
 from colors import Colors
 from effects import matrix_rain_effect, wait_for_key
 from ui import cyberpunk_header
-from progress import display_cyberpunk_progress_bar
+from progress import format_cyberpunk_progress_bar
+from mailtm import BASE_URL
+import account_store
+import metrics
+import terminal
 
 PROXY_FILE = "working_proxies.txt"
-MAIL_TM_BASE = "https://api.mail.tm"
-ACCOUNTS_FILE = "accounts.txt"
+MAIL_TM_BASE = BASE_URL
+# MAILTM_USE_PROXIES=0 connects directly, e.g. to a local stand-in server
+USE_PROXIES = os.environ.get("MAILTM_USE_PROXIES", "1") != "0"
 
 def get_random_proxy():
     """
     Load proxies from PROXY_FILE, shuffle them, and return the first
-    one that successfully connects to the mail.tm API.
+    one that successfully connects to the mail.tm API. Returns None
+    (a direct connection) when USE_PROXIES is off.
     """
+    if not USE_PROXIES:
+        return None
     with open(PROXY_FILE, "r") as f:
         proxies = [line.strip() for line in f if line.strip()]
     random.shuffle(proxies)
@@ -27,12 +36,12 @@ def get_random_proxy():
             "https": f"http://{proxy}"
         }
         try:
-            r = requests.get(MAIL_TM_BASE, proxies=proxy_dict, timeout=10)
+            r = metrics.timed("GET", MAIL_TM_BASE, requests.request, proxies=proxy_dict, timeout=10)
             if r.status_code == 200:
-                print(f"{Colors.BRIGHT_GREEN}✅ Working proxy: {Colors.BRIGHT_CYAN}{proxy}{Colors.RESET}")
+                terminal.post(f"{Colors.BRIGHT_GREEN}✅ Working proxy: {Colors.BRIGHT_CYAN}{proxy}{Colors.RESET}")
                 return proxy_dict
         except requests.RequestException:
-            print(f"{Colors.BRIGHT_RED}❌ Proxy failed: {Colors.BRIGHT_BLACK}{proxy}{Colors.RESET}")
+            terminal.post(f"{Colors.BRIGHT_RED}❌ Proxy failed: {Colors.BRIGHT_BLACK}{proxy}{Colors.RESET}")
     raise RuntimeError("🚫 No working proxies found.")
 
 def generate_random_email():
@@ -48,7 +57,7 @@ def get_domain(proxy):
     """
     Fetch the first available domain from the mail.tm API.
     """
-    r = requests.get(f"{MAIL_TM_BASE}/domains", proxies=proxy, timeout=10)
+    r = metrics.timed("GET", f"{MAIL_TM_BASE}/domains", requests.request, proxies=proxy, timeout=10)
     r.raise_for_status()
     domains = r.json().get("hydra:member", [])
     if not domains:
@@ -57,18 +66,17 @@ def get_domain(proxy):
 
 def create_account(username, password, domain, proxy):
     """
-    Call the mail.tm account-creation endpoint. On success, append to ACCOUNTS_FILE.
+    Call the mail.tm account-creation endpoint. On success, save it to the account store.
     """
     email = f"{username}@{domain}"
     payload = {"address": email, "password": password}
-    r = requests.post(f"{MAIL_TM_BASE}/accounts", json=payload, proxies=proxy, timeout=15)
+    r = metrics.timed("POST", f"{MAIL_TM_BASE}/accounts", requests.request, json=payload, proxies=proxy, timeout=15)
     if r.status_code == 201:
-        print(
+        terminal.post(
             f"\n{Colors.BRIGHT_GREEN}🎉 Created:{Colors.BRIGHT_CYAN} {email}"
             f"{Colors.RESET} | {Colors.BRIGHT_YELLOW}Pwd:{password}{Colors.RESET}"
         )
-        with open(ACCOUNTS_FILE, "a") as f:
-            f.write(f"{email} | {password}\n")
+        account_store.add_account(email, password)
         return True
     else:
         raise RuntimeError(f"❌ Creation failed: {r.status_code} {r.text}")
@@ -100,10 +108,13 @@ def create_accounts_menu():
     created = 0
     failed = 0
 
+    def show_progress():
+        bar = format_cyberpunk_progress_bar(created, total)
+        terminal.set_line("progress", lambda tick: f"{bar} {Colors.BRIGHT_CYAN}{terminal.SPINNER[tick % len(terminal.SPINNER)]}{Colors.RESET}")
+
+    # The progress bar stays live at the bottom while requests run
     while created < total:
-        # show progress before each attempt
-        display_cyberpunk_progress_bar(created, total)
-        print("\n")
+        show_progress()
 
         try:
             proxy = get_random_proxy()
@@ -112,14 +123,18 @@ def create_accounts_menu():
             password = generate_password()
             create_account(username, password, domain, proxy)
             created += 1
+            show_progress()
             time.sleep(0.5)
         except Exception as e:
             failed += 1
-            print(f"\n{Colors.BRIGHT_RED}⚠️  {e}{Colors.RESET}")
+            terminal.post(f"\n{Colors.BRIGHT_RED}⚠️  {e}{Colors.RESET}")
             if failed >= 5:
-                print(f"\n{Colors.BRIGHT_RED}[CRITICAL] Too many failures; aborting.{Colors.RESET}")
+                terminal.post(f"\n{Colors.BRIGHT_RED}[CRITICAL] Too many failures; aborting.{Colors.RESET}")
                 break
 
+    terminal.remove_line("progress", final=format_cyberpunk_progress_bar(created, total))
+    terminal.flush()
+
     # final summary
     cyberpunk_header("EXECUTION COMPLETE", Colors.BRIGHT_GREEN)
     print(f"\n   {Colors.BRIGHT_GREEN}[SUCCESS]{Colors.RESET} Accounts generated: {Colors.BRIGHT_WHITE}{created}{Colors.RESET}")
@@ -0,0 +1,70 @@
+from colors import Colors
+from effects import wait_for_key
+from ui import cyberpunk_header, cyberpunk_input_prompt
+import account_store
+import mail_export
+import terminal
+
+def _progress_line(address, exported, skipped, failed):
+    return (f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}EXPORT]{Colors.RESET} "
+            f"{Colors.BRIGHT_CYAN}{address}{Colors.RESET} "
+            f"{Colors.BRIGHT_GREEN}{exported} written{Colors.RESET} "
+            f"{Colors.BRIGHT_BLACK}{skipped} resumed{Colors.RESET} "
+            f"{Colors.BRIGHT_RED if failed else Colors.BRIGHT_BLACK}{failed} failed{Colors.RESET}")
+
+def _summary_line(address, result):
+    if isinstance(result, Exception):
+        return f"  {Colors.BRIGHT_RED}[FAILED]{Colors.RESET} {address}: {result}"
+    exported, skipped, failures = result
+    status = f"{Colors.BRIGHT_YELLOW}[PARTIAL]" if failures else f"{Colors.BRIGHT_GREEN}[DONE]"
+    return (f"  {status}{Colors.RESET} {Colors.BRIGHT_WHITE}{address}{Colors.RESET} "
+            f"{exported} new, {skipped} already archived, {len(failures)} failed")
+
+def export_archive_menu():
+    """
+    Archive raw message sources of one or all stored accounts to mbox or
+    Maildir under exports/. Interrupted exports resume from their
+    checkpoint file.
+    """
+    cyberpunk_header("ARCHIVE EXPORT", Colors.BRIGHT_CYAN)
+    print(f"\n{Colors.BRIGHT_BLACK}{account_store.count_accounts()} stored accounts | "
+          f"output folder: {mail_export.EXPORT_DIR}/{Colors.RESET}")
+    address = cyberpunk_input_prompt("ACCOUNT ADDRESS, '*' FOR ALL (or '<' to go back)", Colors.BRIGHT_CYAN).strip()
+    if address == '<' or not address:
+        return
+    choice = cyberpunk_input_prompt("FORMAT: [M]box or Mail[D]ir", Colors.BRIGHT_YELLOW).strip().upper()
+    fmt = "maildir" if choice == 'D' else "mbox"
+
+    def on_account(address, target):
+        terminal.post(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}TARGET]{Colors.RESET} {address} -> {target}")
+        terminal.set_line("export", _progress_line(address, 0, 0, 0))
+
+    def on_progress(address, exported, skipped, failed):
+        terminal.set_line("export", _progress_line(address, exported, skipped, failed))
+
+    try:
+        if address == '*':
+            results = mail_export.export_all(fmt, on_account=on_account, on_progress=on_progress)
+        else:
+            password = account_store.get_password(address)
+            target = mail_export.account_target(address, fmt)
+            on_account(address, target)
+            try:
+                from inbox import authenticate_email
+                token = authenticate_email(address, password)
+                if not token:
+                    raise Exception(f"No password or cached token for {address}")
+                results = {address: mail_export.export_account(
+                    token, target, fmt, on_progress=lambda *counts: on_progress(address, *counts))}
+            except Exception as e:
+                results = {address: e}
+    finally:
+        terminal.remove_line("export")
+        terminal.flush()
+
+    cyberpunk_header("EXPORT COMPLETE", Colors.BRIGHT_GREEN)
+    if not results:
+        print(f"\n{Colors.BRIGHT_YELLOW}No stored accounts to export{Colors.RESET}")
+    for address, result in results.items():
+        print(_summary_line(address, result))
+    wait_for_key()
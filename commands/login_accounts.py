@@ -1,20 +1,42 @@
 from colors import Colors
-from effects import matrix_rain_effect, wait_for_key
+from effects import matrix_rain_effect, wait_for_key, getch
 from ui import cyberpunk_header, cyberpunk_input_prompt
-from progress import display_cyberpunk_progress_bar
+from progress import display_cyberpunk_progress_bar, format_cyberpunk_progress_bar
+from inbox import (authenticate_email, iter_new_messages, sync_inbox,
+                   get_account_id, download_details, get_message_details)
+import token_store
+import account_store
+import message_cache
+import detail_cache
+from mercure import subscribe
+from mailtm import current_token
+import attachments
+import bulk_actions
+from html_text import message_text
+from pager import show_text
+import terminal
 
-import requests
-import sys
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from rich.table import Table
-from rich.console import Console
-from rich import box
+from functools import partial
+from itertools import islice
 
-# Initialize Rich console
-console = Console(force_terminal=True, color_system="auto")
+# Background detail prefetch: unread rows fetched ahead, worker count, and
+# the minimum gap between prefetch requests to stay under mail.tm's rate limit
+PREFETCH_COUNT = 5
+PREFETCH_WORKERS = 2
+PREFETCH_INTERVAL = 0.25
+# Rows of a cold inbox shown before the menu opens (one API page); the
+# rest is cached in the background
+COLD_ROWS = 30
 
-BASE_URL = "https://api.mail.tm"
-MERCURE_URL = "https://mercure.mail.tm/.well-known/mercure"
+# message id -> Future of an in-flight prefetch into detail_cache
+_prefetched = {}
+_prefetch_lock = threading.Lock()
+_last_prefetch = [0.0]
 
 def cyberpunk_password_prompt(prompt):
     """Password input with asterisk masking in cyberpunk style with navigation"""
@@ -52,111 +74,197 @@ def cyberpunk_password_prompt(prompt):
     
     return ''.join(password)
 
-# You'll need to add this helper function
-def getch():
-    """Get a single character from stdin, cross-platform version"""
+def start_inbox_push(token, account, pushed):
+    """
+    Subscribe to the account's Mercure topic. New or updated messages are
+    written to the cache, their rows are posted through the terminal
+    module as they arrive (the callback runs on the subscription thread)
+    and `pushed` is set so the inbox menu picks up the new numbering.
+    Returns a stop() callable, or None if live updates are unavailable.
+    """
     try:
-        # For Windows
-        import msvcrt
-        return msvcrt.getch().decode('utf-8')
-    except ImportError:
-        # For Unix
-        import tty, termios
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
+        account_id = get_account_id(token)
+    except Exception:
+        return None
+
+    def on_update(payload):
+        if payload.get('@type') != 'Message' or 'id' not in payload:
+            return
+        changed_ids = message_cache.store_messages(account, [payload])
+        if not changed_ids:
+            return
+        emails = message_cache.cached_messages(account)
+        rows = [format_email_row(index, email) for index, email in enumerate(emails, 1)
+                if email.get('id') in changed_ids]
+        terminal.post("\n".join([f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_GREEN}PUSH]{Colors.RESET} "
+                                 f"{Colors.BRIGHT_WHITE}Live update received{Colors.RESET}",
+                                 *format_table_header(), *rows]))
+        pushed.set()
+
+    def on_error(message):
+        terminal.post(f"{Colors.BRIGHT_BLACK}[{Colors.NEON_RED}PUSH]{Colors.RESET} "
+                      f"{Colors.BRIGHT_WHITE}Live updates stopped: {message}{Colors.RESET}")
+
+    # Reconnects ask mailtm for the account's current token
+    return subscribe(f"/accounts/{account_id}", partial(current_token, token), on_update,
+                     on_error=on_error)
+
+def start_background_sync(walk, pushed):
+    """
+    Drain the rest of a cold inbox walk (iter_new_messages) on a daemon
+    thread, so the menu opens after the first page. Pages land in the
+    cache as they arrive; when the walk is done `pushed` is set so the
+    menu picks up the full numbering. Returns a stop() callable; a
+    stopped walk resumes from its cursor on the next sync.
+    """
+    stop = threading.Event()
+
+    def run():
+        count = 0
         try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
+            for _ in walk:
+                if stop.is_set():
+                    return
+                count += 1
+        except Exception as e:
+            terminal.post(f"{Colors.BRIGHT_BLACK}[{Colors.NEON_RED}SYNC]{Colors.RESET} "
+                          f"{Colors.BRIGHT_WHITE}Loading older messages failed: {e}{Colors.RESET}")
+            return
         finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-        return ch
+            walk.close()
+        if count:
+            terminal.post(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_GREEN}SYNC]{Colors.RESET} "
+                          f"{Colors.BRIGHT_WHITE}{count} older messages loaded{Colors.RESET}")
+            pushed.set()
 
-def authenticate_email(email, password):
-    """Authenticate with Mail.tm API and return token"""
-    try:
-        response = requests.post(
-            f"{BASE_URL}/token",
-            json={"address": email, "password": password}
-        )
-        response.raise_for_status()
-        return response.json().get("token")
-    except requests.exceptions.RequestException as e:
-        error_msg = e.response.json().get("detail", "Authentication failed") if hasattr(e, 'response') else str(e)
-        raise Exception(f"Authentication error: {error_msg}")
-
-def fetch_emails(token):
-    """Fetch messages from Mail.tm API with proper error handling"""
-    try:
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/messages", headers=headers)
-        response.raise_for_status()
-        return response.json().get("hydra:member", [])  # Correct key is "hydra:member"
-    except requests.exceptions.RequestException as e:
-        error_msg = e.response.json().get("detail", "Failed to fetch messages") if hasattr(e, 'response') else str(e)
-        raise Exception(f"Fetch error: {error_msg}")
-
-def get_message_details(token, message_id):
-    """Get full message details"""
-    try:
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/messages/{message_id}", headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException:
-        return None
+    threading.Thread(target=run, name="inbox-sync", daemon=True).start()
+    return stop.set
 
-def display_emails_table(emails):
+def _prefetch_details(token, message_id):
+    """Worker: fetch one message, spacing requests PREFETCH_INTERVAL apart"""
+    if detail_cache.contains(message_id):
+        return
+    with _prefetch_lock:
+        wait = _last_prefetch[0] + PREFETCH_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_prefetch[0] = time.monotonic()
+    download_details(token, message_id)
+
+def start_prefetch(token, emails):
     """
-    Display emails in a simple table format using print() with numbering
+    Prefetch details of the first PREFETCH_COUNT unread messages on a
+    small worker pool while the inbox table is on screen.
+    Returns a cancel() callable that drops queued work; finished
+    prefetches stay in the detail cache.
     """
-    if not emails:
-        print(f"\n{Colors.BRIGHT_YELLOW}No messages found{Colors.RESET}")
+    executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+    unread = [e['id'] for e in emails if not e.get('seen')][:PREFETCH_COUNT]
+    for message_id in unread:
+        if message_id not in _prefetched and not detail_cache.contains(message_id):
+            _prefetched[message_id] = executor.submit(_prefetch_details, token, message_id)
+
+    def cancel():
+        executor.shutdown(wait=False, cancel_futures=True)
+        _prefetched.clear()
+
+    return cancel
+
+def wait_for_prefetch(message_id):
+    """
+    Let an in-flight prefetch of `message_id` land in the detail cache.
+    A prefetch that has not started yet is cancelled instead, since a
+    direct fetch is quicker than waiting in the queue.
+    """
+    future = _prefetched.pop(message_id, None)
+    if future is None or future.cancel():
         return
-        
-    # Print table header
-    print(f"\n{Colors.BRIGHT_CYAN}{'#':<3} {Colors.BRIGHT_CYAN}{'FROM':<22} {Colors.BRIGHT_WHITE}{'SUBJECT':<37} {Colors.BRIGHT_YELLOW}{'DATE':<15} {Colors.BRIGHT_GREEN}STATUS{Colors.RESET}")
-    print(f"{Colors.BRIGHT_BLACK}{'-'*90}{Colors.RESET}")
+    try:
+        future.result(timeout=15)
+    except Exception:
+        pass
+
+def format_cache_stats():
+    """One-line summary of detail cache hits, misses and memory use"""
+    stats = detail_cache.stats()
+    return (f"{Colors.BRIGHT_BLACK}Detail cache: {stats['hits']} hits / {stats['misses']} misses | "
+            f"{stats['entries']} msgs, {stats['bytes'] // 1024} KB of {stats['max_bytes'] // 1024} KB{Colors.RESET}")
+
+def format_table_header():
+    """The heading lines of the inbox table."""
+    return [f"\n{Colors.BRIGHT_CYAN}{'#':<3} {Colors.BRIGHT_CYAN}{'FROM':<22} {Colors.BRIGHT_WHITE}{'SUBJECT':<37} {Colors.BRIGHT_YELLOW}{'DATE':<15} {Colors.BRIGHT_GREEN}STATUS{Colors.RESET}",
+            f"{Colors.BRIGHT_BLACK}{'-'*90}{Colors.RESET}"]
+
+def format_email_row(index, email):
+    """One numbered inbox table row."""
+    # Extract sender information
+    sender = email.get('from', {})
+    from_name = sender.get('name', sender.get('address', 'Unknown'))
+    if len(from_name) > 22:
+        from_name = from_name[:19] + "..."
     
+    # Truncate long subjects
+    subject = email.get('subject', 'No Subject')
+    if len(subject) > 37:
+        subject = subject[:34] + "..."
+    
+    # Format date using 'createdAt'
+    date_str = email.get('createdAt', 'Unknown')
+    try:
+        # Simple string slicing since API returns ISO format
+        # Format: "2024-01-15T14:30:00.000Z"
+        date_str = date_str[5:10] + " " + date_str[11:16]  # Extract MM-DD HH:MM
+    except (ValueError, TypeError):
+        date_str = 'Unknown'
+    
+    # Determine status indicator
+    if email.get('seen', False):
+        status = f"{Colors.BRIGHT_BLACK}READ{Colors.RESET}"
+    else:
+        status = f"{Colors.BRIGHT_GREEN}NEW{Colors.RESET}"
+    
+    return f"{Colors.BRIGHT_YELLOW}{index:<3}{Colors.RESET} {Colors.BRIGHT_CYAN}{from_name:<22}{Colors.RESET} {Colors.BRIGHT_WHITE}{subject:<37}{Colors.RESET} {Colors.BRIGHT_YELLOW}{date_str:<15}{Colors.RESET} {status}"
+
+def display_emails_table(emails, only_ids=None):
+    """
+    Display emails in a simple table format using print() with numbering.
+    `emails` may be a generator; rows are printed as they arrive.
+    When `only_ids` is given, only those rows are re-rendered.
+    """
+    total = 0
     for index, email in enumerate(emails, 1):
-        # Extract sender information
-        sender = email.get('from', {})
-        from_name = sender.get('name', sender.get('address', 'Unknown'))
-        if len(from_name) > 22:
-            from_name = from_name[:19] + "..."
-        
-        # Truncate long subjects
-        subject = email.get('subject', 'No Subject')
-        if len(subject) > 37:
-            subject = subject[:34] + "..."
-        
-        # Format date using 'createdAt'
-        date_str = email.get('createdAt', 'Unknown')
-        try:
-            # Simple string slicing since API returns ISO format
-            # Format: "2024-01-15T14:30:00.000Z"
-            date_str = date_str[5:10] + " " + date_str[11:16]  # Extract MM-DD HH:MM
-        except (ValueError, TypeError):
-            date_str = 'Unknown'
-        
-        # Determine status indicator
-        if email.get('seen', False):
-            status = f"{Colors.BRIGHT_BLACK}READ{Colors.RESET}"
-        else:
-            status = f"{Colors.BRIGHT_GREEN}NEW{Colors.RESET}"
-        
+        total = index
+        if index == 1:
+            # Print table header
+            print("\n".join(format_table_header()))
+
+        if only_ids is not None and email.get('id') not in only_ids:
+            continue
+
         # Print each row with number
-        print(f"{Colors.BRIGHT_YELLOW}{index:<3}{Colors.RESET} {Colors.BRIGHT_CYAN}{from_name:<22}{Colors.RESET} {Colors.BRIGHT_WHITE}{subject:<37}{Colors.RESET} {Colors.BRIGHT_YELLOW}{date_str:<15}{Colors.RESET} {status}")
+        print(format_email_row(index, email))
     
-    print(f"\n{Colors.BRIGHT_BLACK}Showing {len(emails)} messages{Colors.RESET}")
+    if not total:
+        print(f"\n{Colors.BRIGHT_YELLOW}No messages found{Colors.RESET}")
+    elif only_ids is not None:
+        print(f"\n{Colors.BRIGHT_BLACK}Updated {len(only_ids)} of {total} messages{Colors.RESET}")
+    else:
+        print(f"\n{Colors.BRIGHT_BLACK}Showing {total} messages{Colors.RESET}")
+
+def show_inbox_changes(emails, changed_ids):
+    """Re-render only the rows that a sync added or changed"""
+    if changed_ids:
+        cyberpunk_header("INBOX UPDATED", Colors.BRIGHT_GREEN)
+        display_emails_table(emails, only_ids=changed_ids)
+    else:
+        print(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_GREEN}SYNC]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}Inbox up to date ({len(emails)} messages){Colors.RESET}")
 
 def view_email_details(token, email_id):
     """Display detailed view of a single email"""
-    try:
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{BASE_URL}/messages/{email_id}", headers=headers)
-        response.raise_for_status()
-        email = response.json()
-    except Exception:
+    wait_for_prefetch(email_id)
+    email = get_message_details(token, email_id)
+    if email is None:
         print(f"\n{Colors.BRIGHT_RED}Failed to load email details{Colors.RESET}")
         return
     
@@ -183,11 +291,11 @@ def view_email_details(token, email_id):
     # Subject
     print(f"{Colors.BRIGHT_CYAN}Subject:{Colors.RESET} {email.get('subject', 'No Subject')}")
     
-    # Body
-    body = email.get('text', 'No message content')
-    if not body:
-        body = "No message content"
-    print(f"\n{Colors.BRIGHT_WHITE}{body}{Colors.RESET}")
+    # Body: the HTML part is converted when there is no text part; long
+    # bodies open in the pager instead of flooding the terminal
+    body = message_text(email) or "No message content"
+    print()
+    show_text(body, title=f"{sender.get('address', '')} | {email.get('subject', 'No Subject')}")
     
     # Attachments
     if email.get('hasAttachments', False):
@@ -196,6 +304,106 @@ def view_email_details(token, email_id):
         for att in attachments:
             print(f"  - {att.get('filename', 'Unnamed')} ({att.get('size', 0)} bytes)")
 
+def _attachment_progress_line(att, received, total):
+    name = att.get('filename', 'Unnamed')[:28]
+    if total:
+        return f"  {Colors.BRIGHT_CYAN}{name:<28}{Colors.RESET} {format_cyberpunk_progress_bar(received, total, 30)}"
+    return f"  {Colors.BRIGHT_CYAN}{name:<28}{Colors.RESET} {Colors.NEON_CYAN}{received // 1024} KB{Colors.RESET}"
+
+def download_message_attachments(token, email_id):
+    """
+    Download all attachments of a message to attachments/<id>/, several
+    at once, with a live progress line per file. Partial files left by an
+    interrupted download are resumed.
+    """
+    email = get_message_details(token, email_id)
+    files = (email or {}).get('attachments') or []
+    if not files:
+        print(f"\n{Colors.BRIGHT_YELLOW}This message has no attachments{Colors.RESET}")
+        return
+    print(f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}DOWNLOAD]{Colors.RESET} "
+          f"{Colors.BRIGHT_WHITE}{len(files)} attachment(s), {attachments.MAX_PARALLEL} at a time{Colors.RESET}")
+
+    def on_progress(att, received, total):
+        terminal.set_line(att.get('id'), _attachment_progress_line(att, received, total))
+
+    try:
+        results = attachments.download_attachments(token, email_id, files, on_progress=on_progress)
+    finally:
+        for att in files:
+            terminal.remove_line(att.get('id'))
+        terminal.flush()
+    for att, path, error in results:
+        if error is None:
+            print(f"  {Colors.BRIGHT_GREEN}[SAVED]{Colors.RESET} {Colors.BRIGHT_WHITE}{path}{Colors.RESET}")
+        else:
+            print(f"  {Colors.BRIGHT_RED}[FAILED]{Colors.RESET} {att.get('filename', 'Unnamed')}: {error}")
+
+def _select_for_bulk(emails, selection):
+    """Resolve a bulk selection: numbers/ranges, ALL, READ, UNREAD, FROM:, SUBJECT: or OLDER:."""
+    key, _, value = selection.partition(':')
+    key = key.strip().upper()
+    if key == 'ALL':
+        return list(emails)
+    if key in ('READ', 'UNREAD'):
+        return bulk_actions.select_messages(emails, seen=(key == 'READ'))
+    if key == 'FROM':
+        return bulk_actions.select_messages(emails, sender=value.strip())
+    if key == 'SUBJECT':
+        return bulk_actions.select_messages(emails, subject=value.strip())
+    if key == 'OLDER':
+        return bulk_actions.select_messages(emails, older_than_days=float(value))
+    return [emails[i] for i in bulk_actions.parse_selection(selection, len(emails))]
+
+def bulk_inbox_actions(token, account, emails):
+    """
+    Mark read or delete a selection of messages concurrently, with one
+    aggregated progress bar and a report of the items that failed.
+    Returns True if anything changed.
+    """
+    print(f"\n{Colors.BRIGHT_BLACK}Select by number (1-5,8), ALL, READ, UNREAD, "
+          f"FROM:<text>, SUBJECT:<regex> or OLDER:<days>{Colors.RESET}")
+    selection = cyberpunk_input_prompt("SELECT MESSAGES", Colors.BRIGHT_CYAN).strip()
+    try:
+        selected = _select_for_bulk(emails, selection)
+    except (ValueError, IndexError, re.error) as e:
+        print(f"{Colors.BRIGHT_RED}Invalid selection: {e}{Colors.RESET}")
+        return False
+    if not selected:
+        print(f"{Colors.BRIGHT_YELLOW}No messages match{Colors.RESET}")
+        return False
+
+    choice = cyberpunk_input_prompt(f"{len(selected)} SELECTED: [M]ark read, [X] delete, [C]ancel",
+                                    Colors.BRIGHT_YELLOW).strip().upper()
+    action = {'M': 'read', 'X': 'delete'}.get(choice)
+    if action is None:
+        return False
+    if action == 'delete':
+        confirm = cyberpunk_input_prompt(f"DELETE {len(selected)} MESSAGES? (y/N)", Colors.BRIGHT_RED)
+        if confirm.strip().lower() != 'y':
+            return False
+
+    def on_progress(done, failed, total):
+        terminal.set_line("bulk", f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}{action.upper()}]{Colors.RESET} "
+                                  f"{format_cyberpunk_progress_bar(done + failed, total, 30)} "
+                                  f"{Colors.BRIGHT_RED if failed else Colors.BRIGHT_BLACK}{failed} failed{Colors.RESET}")
+
+    started = time.perf_counter()
+    try:
+        done, failures = bulk_actions.run(((account, token, e['id']) for e in selected), action,
+                                          on_progress=on_progress)
+    finally:
+        terminal.remove_line("bulk")
+        terminal.flush()
+    count = sum(len(ids) for ids in done.values())
+    print(f"\n{Colors.BRIGHT_GREEN}[DONE]{Colors.RESET} {Colors.BRIGHT_WHITE}{count} messages "
+          f"{'marked read' if action == 'read' else 'deleted'} in {time.perf_counter() - started:.1f}s{Colors.RESET}")
+    for _, message_id, error in failures[:10]:
+        print(f"  {Colors.BRIGHT_RED}[FAILED]{Colors.RESET} {message_id}: {error}")
+    if len(failures) > 10:
+        print(f"  {Colors.BRIGHT_BLACK}... and {len(failures) - 10} more{Colors.RESET}")
+    return count > 0
+
 def login_email_account_menu():
     """
     Display the 'EMAIL ACCOUNT LOGIN' UI with enhanced navigation
@@ -205,19 +413,23 @@ def login_email_account_menu():
         
         # Get email with back option
         email = cyberpunk_input_prompt("ENTER EMAIL ADDRESS (or '<' to go back)", Colors.BRIGHT_CYAN)
-        if email.strip() == '<':
+        email = email.strip()
+        if email == '<':
             return  # Go back to main menu
             
-        # Get password with back option
-        password = cyberpunk_password_prompt(
-            f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}>]{Colors.RESET} "
-            f"{Colors.BRIGHT_WHITE}ENTER PASSWORD (or '<' to go back){Colors.RESET} "
-            f"{Colors.BRIGHT_BLUE}►{Colors.RESET} "
-        )
-        
-        # If user entered '<' in password, restart the loop
-        if password is None:
-            continue
+        # Stored accounts and cached tokens skip the password prompt
+        password = account_store.get_password(email)
+        if password is None and not token_store.cached_token(email):
+            # Get password with back option
+            password = cyberpunk_password_prompt(
+                f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}>]{Colors.RESET} "
+                f"{Colors.BRIGHT_WHITE}ENTER PASSWORD (or '<' to go back){Colors.RESET} "
+                f"{Colors.BRIGHT_BLUE}►{Colors.RESET} "
+            )
+            
+            # If user entered '<' in password, restart the loop
+            if password is None:
+                continue
             
         # Authentication
         print(f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}AUTH]{Colors.RESET} "
@@ -229,53 +441,108 @@ def login_email_account_menu():
             if not token:
                 raise Exception("Authentication failed")
                 
-            # Fetch emails
+            # Show the cached inbox straight away, then sync only what is new
+            cached = message_cache.cached_messages(email)
+            if cached:
+                cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
+                display_emails_table(cached)
+
             print(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}FETCH]{Colors.RESET} "
                   f"{Colors.BRIGHT_WHITE}Retrieving messages...{Colors.RESET}")
-            emails = fetch_emails(token)
-            
-            # Display results
-            cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
-            display_emails_table(emails)
+
+            walk = None
+            if cached:
+                changed_ids = sync_inbox(token, email)
+                emails = message_cache.cached_messages(email)
+                show_inbox_changes(emails, changed_ids)
+            else:
+                # Cold cache: show the first page, cache the rest in the background
+                cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
+                walk = iter_new_messages(token, email)
+                display_emails_table(list(islice(walk, COLD_ROWS)))
+                emails = message_cache.cached_messages(email)
+
+            # Live updates over Mercure while the inbox is open; the
+            # background walk signals the same way when it is done
+            pushed = threading.Event()
+            stop_push = start_inbox_push(token, email, pushed)
+            stop_sync = start_background_sync(walk, pushed) if walk else None
+            # Warm the top unread rows while the user reads the table
+            cancel_prefetch = start_prefetch(token, emails)
             
             # Inbox action menu
-            while True:
-                print(f"\n{Colors.BRIGHT_CYAN}INBOX OPTIONS:{Colors.RESET}")
-                print(f"  {Colors.BRIGHT_GREEN}[R]{Colors.RESET} Refresh inbox")
-                print(f"  {Colors.BRIGHT_GREEN}[B]{Colors.RESET} Back to login")
-                print(f"  {Colors.BRIGHT_GREEN}[M]{Colors.RESET} Main menu")
-                print(f"\n{Colors.BRIGHT_YELLOW}Or enter a message number to view it{Colors.RESET}")
+            try:
+                while True:
+                    print(f"\n{Colors.BRIGHT_CYAN}INBOX OPTIONS:{Colors.RESET}")
+                    print(f"  {Colors.BRIGHT_GREEN}[R]{Colors.RESET} Refresh inbox")
+                    print(f"  {Colors.BRIGHT_GREEN}[D]{Colors.RESET} Download attachments")
+                    print(f"  {Colors.BRIGHT_GREEN}[A]{Colors.RESET} Bulk mark read / delete")
+                    print(f"  {Colors.BRIGHT_GREEN}[B]{Colors.RESET} Back to login")
+                    print(f"  {Colors.BRIGHT_GREEN}[M]{Colors.RESET} Main menu")
+                    print(f"\n{Colors.BRIGHT_YELLOW}Or enter a message number to view it{Colors.RESET}")
+                    print(format_cache_stats())
                 
-                action = cyberpunk_input_prompt("SELECT ACTION", Colors.BRIGHT_YELLOW).strip().upper()
+                    action = cyberpunk_input_prompt("SELECT ACTION", Colors.BRIGHT_YELLOW).strip().upper()
+
+                    # Pick up rows pushed while the prompt was open
+                    if pushed.is_set():
+                        pushed.clear()
+                        emails = message_cache.cached_messages(email)
+                        cancel_prefetch()
+                        cancel_prefetch = start_prefetch(token, emails)
                 
-                # Handle message number input
-                if action.isdigit():
-                    msg_index = int(action) - 1
-                    if 0 <= msg_index < len(emails):
-                        view_email_details(token, emails[msg_index]['id'])
-                        cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
-                        display_emails_table(emails)
-                    else:
-                        print(f"{Colors.BRIGHT_RED}Invalid message number. Please enter a number between 1 and {len(emails)}{Colors.RESET}")
+                    # Handle message number input
+                    if action.isdigit():
+                        msg_index = int(action) - 1
+                        if 0 <= msg_index < len(emails):
+                            view_email_details(token, emails[msg_index]['id'])
+                            message_cache.mark_seen(email, emails[msg_index]['id'])
+                            emails[msg_index]['seen'] = True
+                            cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
+                            display_emails_table(emails)
+                        else:
+                            print(f"{Colors.BRIGHT_RED}Invalid message number. Please enter a number between 1 and {len(emails)}{Colors.RESET}")
                 
-                # Handle letter commands
-                elif action == 'R':
-                    # Refresh inbox
-                    print(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}FETCH]{Colors.RESET} Refreshing messages...")
-                    emails = fetch_emails(token)
-                    cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
-                    display_emails_table(emails)
+                    # Handle letter commands
+                    elif action == 'R':
+                        # Refresh inbox: fetch only messages newer than the cache
+                        print(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}FETCH]{Colors.RESET} Refreshing messages...")
+                        changed_ids = sync_inbox(token, email)
+                        emails = message_cache.cached_messages(email)
+                        show_inbox_changes(emails, changed_ids)
+                        if changed_ids:
+                            cancel_prefetch()
+                            cancel_prefetch = start_prefetch(token, emails)
                 
-                elif action == 'B':
-                    # Back to login screen
-                    break
+                    elif action == 'D':
+                        number = cyberpunk_input_prompt("MESSAGE NUMBER", Colors.BRIGHT_CYAN).strip()
+                        if number.isdigit() and 0 < int(number) <= len(emails):
+                            download_message_attachments(token, emails[int(number) - 1]['id'])
+                        else:
+                            print(f"{Colors.BRIGHT_RED}Invalid message number. Please enter a number between 1 and {len(emails)}{Colors.RESET}")
+
+                    elif action == 'A':
+                        if bulk_inbox_actions(token, email, emails):
+                            emails = message_cache.cached_messages(email)
+                            cyberpunk_header("INBOX ACCESS GRANTED", Colors.BRIGHT_GREEN)
+                            display_emails_table(emails)
+
+                    elif action == 'B':
+                        # Back to login screen
+                        break
                 
-                elif action == 'M':
-                    # Return to main menu
-                    return
+                    elif action == 'M':
+                        # Return to main menu
+                        return
                 
-                else:
-                    print(f"{Colors.BRIGHT_RED}Invalid option. Please choose R, B, M, or enter a message number.{Colors.RESET}")
+                    else:
+                        print(f"{Colors.BRIGHT_RED}Invalid option. Please choose R, D, A, B, M, or enter a message number.{Colors.RESET}")
+            finally:
+                cancel_prefetch()
+                if stop_push:
+                    stop_push()
+                if stop_sync:
+                    stop_sync()
             
         except Exception as e:
             cyberpunk_header("ACCESS DENIED", Colors.BRIGHT_RED)
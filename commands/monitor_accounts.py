@@ -0,0 +1,154 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from colors import Colors
+from effects import clear_screen, wait_for_key
+from ui import cyberpunk_header
+from mailtm import BASE_URL, get_token, request
+import message_cache
+import account_store
+
+# At most this many API calls in flight across all accounts
+MAX_CONCURRENCY = 8
+# Seconds between inbox polls of one account
+POLL_INTERVAL = 20
+# Per-account exponential backoff after failures, in seconds
+BACKOFF_BASE = 5
+BACKOFF_MAX = 300
+# Seconds between redraws of the merged inbox
+REDRAW_INTERVAL = 3
+MERGED_ROWS = 20
+
+def load_accounts():
+    """Return (email, password) pairs of every stored account."""
+    return [(a["address"], a["password"]) for a in account_store.iter_accounts()]
+
+def _poll_inbox(email, password):
+    """
+    Blocking worker: fetch the first /messages page of one account and
+    cache it. Returns the ids that were new or changed.
+
+    When the page does not reach mail that is already cached (a never
+    synced account, or more new mail than one page), the older pages are
+    left to the next inbox sync: the account is marked incomplete with
+    its cursor on page two, see inbox.iter_new_messages.
+    """
+    token = get_token(email, password)
+    response = request("GET", f"{BASE_URL}/messages", headers={"Authorization": f"Bearer {token}"})
+    if response.status_code == 401:
+        token = get_token(email, password, force=True)
+        response = request("GET", f"{BASE_URL}/messages", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    data = response.json()
+    messages = data.get("hydra:member", [])
+    overlaps = any(message_cache.is_known(email, m["id"]) for m in messages)
+    changed = message_cache.store_messages(email, messages)
+    next_page = data.get("hydra:view", {}).get("hydra:next")
+    if not next_page:
+        message_cache.set_sync_state(email, True)
+    elif not overlaps:
+        message_cache.set_sync_state(email, False, urljoin(BASE_URL, next_page))
+    return changed
+
+async def watch_account(email, password, state, limiter, executor):
+    """Poll one account forever, backing off exponentially on failures."""
+    loop = asyncio.get_running_loop()
+    entry = state[email]
+    # Spread the first polls so hundreds of accounts do not fire at once
+    await asyncio.sleep(random.uniform(0, POLL_INTERVAL))
+    while True:
+        try:
+            async with limiter:
+                changed = await loop.run_in_executor(executor, _poll_inbox, email, password)
+            if entry["polls"]:
+                entry["new"] += len(changed)
+            entry["polls"] += 1
+            entry["failures"] = 0
+            entry["error"] = ""
+            delay = POLL_INTERVAL
+        except Exception as e:
+            entry["failures"] += 1
+            entry["error"] = str(e)[:40]
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (entry["failures"] - 1))
+            delay += random.uniform(0, delay / 2)
+        await asyncio.sleep(delay)
+
+def render_monitor(state, started):
+    """Redraw the merged inbox and per-account counters."""
+    clear_screen()
+    cyberpunk_header("UNIFIED INBOX MONITOR", Colors.BRIGHT_CYAN)
+
+    online = sum(1 for e in state.values() if e["polls"] and not e["failures"])
+    failing = sum(1 for e in state.values() if e["failures"])
+    print(f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_GREEN}NODES{Colors.BRIGHT_BLACK}]{Colors.RESET} "
+          f"{Colors.BRIGHT_WHITE}{len(state)} watched | {Colors.BRIGHT_GREEN}{online} synced{Colors.BRIGHT_WHITE} | "
+          f"{Colors.BRIGHT_RED}{failing} backing off{Colors.BRIGHT_WHITE} | "
+          f"uptime {int(time.monotonic() - started)}s{Colors.RESET}")
+
+    active = sorted((e for e in state.values() if e["new"] or e["failures"]),
+                    key=lambda e: (-e["new"], -e["failures"]))[:10]
+    if active:
+        print(f"\n{Colors.BRIGHT_WHITE}{'ACCOUNT':<40} {'NEW':>5}  STATUS{Colors.RESET}")
+        for e in active:
+            status = (f"{Colors.BRIGHT_RED}RETRY: {e['error']}" if e["failures"]
+                      else f"{Colors.BRIGHT_GREEN}OK")
+            print(f"{Colors.BRIGHT_CYAN}{e['email']:<40}{Colors.RESET} "
+                  f"{Colors.BRIGHT_YELLOW}{e['new']:>5}{Colors.RESET}  {status}{Colors.RESET}")
+
+    print(f"\n{Colors.BRIGHT_CYAN}{'ACCOUNT':<28} {'FROM':<22} {'SUBJECT':<28} {'DATE':<12}{Colors.RESET}")
+    print(f"{Colors.BRIGHT_BLACK}{'-'*94}{Colors.RESET}")
+    for account, message in message_cache.recent_messages(state.keys(), MERGED_ROWS):
+        sender = message.get('from', {})
+        from_name = (sender.get('name') or sender.get('address', 'Unknown'))[:22]
+        subject = message.get('subject', 'No Subject')[:28]
+        date_str = message.get('createdAt', '')
+        date_str = date_str[5:10] + " " + date_str[11:16]
+        color = Colors.BRIGHT_BLACK if message.get('seen') else Colors.BRIGHT_WHITE
+        print(f"{Colors.BRIGHT_MAGENTA}{account[:28]:<28}{Colors.RESET} {Colors.BRIGHT_CYAN}{from_name:<22}{Colors.RESET} "
+              f"{color}{subject:<28}{Colors.RESET} {Colors.BRIGHT_YELLOW}{date_str:<12}{Colors.RESET}")
+
+    print(f"\n{Colors.BRIGHT_BLACK}Press Ctrl+C to leave the monitor{Colors.RESET}")
+
+async def run_monitor(accounts):
+    """Watch every account concurrently on one event loop and redraw until cancelled."""
+    state = {
+        email: {"email": email, "new": 0, "polls": 0, "failures": 0, "error": ""}
+        for email, _ in accounts
+    }
+    limiter = asyncio.Semaphore(MAX_CONCURRENCY)
+    executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY)
+    watchers = [asyncio.create_task(watch_account(email, password, state, limiter, executor))
+                for email, password in accounts]
+    started = time.monotonic()
+    try:
+        while True:
+            render_monitor(state, started)
+            await asyncio.sleep(REDRAW_INTERVAL)
+    finally:
+        for task in watchers:
+            task.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def monitor_accounts_menu():
+    """
+    Log into every stored account concurrently and show one merged,
+    live inbox sorted by createdAt.
+    """
+    accounts = load_accounts()
+    if not accounts:
+        cyberpunk_header("UNIFIED INBOX MONITOR", Colors.BRIGHT_CYAN)
+        print(f"\n{Colors.BRIGHT_YELLOW}[WARNING]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}No stored accounts{Colors.RESET}\n")
+        wait_for_key()
+        return
+
+    try:
+        asyncio.run(run_monitor(accounts))
+    except KeyboardInterrupt:
+        print(f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_CYAN}MONITOR]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}Stopped{Colors.RESET}")
+    wait_for_key()
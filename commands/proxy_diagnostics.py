@@ -1,14 +1,47 @@
 # commands/proxy_diagnostics.py
 
 import requests
-import time
 
 from colors import Colors
 from ui import cyberpunk_header, cyberpunk_footer
 from effects import clear_screen, wait_for_key
+from mailtm import BASE_URL
+import metrics
+import terminal
 
 PROXY_FILE = "working_proxies.txt"
 
+def probe_proxy(proxy):
+    """Request the mail.tm API through `proxy` and return a colored status line."""
+    proxy_dict = {
+        "http": f"http://{proxy}",
+        "https": f"http://{proxy}"
+    }
+
+    try:
+        r = metrics.timed("GET", BASE_URL, requests.request, proxies=proxy_dict, timeout=5)
+        if r.status_code == 200:
+            status_color = Colors.NEON_GREEN
+            status_text = "[ONLINE]"
+        else:
+            status_color = Colors.NEON_ORANGE
+            status_text = "[DEGRADED]"
+        return (f"      {status_color}▓{Colors.RESET} "
+                f"{Colors.BRIGHT_WHITE}Status: {status_color}{status_text}{Colors.RESET} "
+                f"{Colors.BRIGHT_BLACK}Response: {status_color}{r.status_code}{Colors.RESET}")
+    except requests.exceptions.Timeout:
+        return (f"      {Colors.NEON_RED}▓{Colors.RESET} "
+                f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[TIMEOUT]{Colors.RESET} "
+                f"{Colors.BRIGHT_BLACK}Connection timed out{Colors.RESET}")
+    except requests.exceptions.ConnectionError:
+        return (f"      {Colors.NEON_RED}▓{Colors.RESET} "
+                f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[OFFLINE]{Colors.RESET} "
+                f"{Colors.BRIGHT_BLACK}Connection refused{Colors.RESET}")
+    except Exception as e:
+        return (f"      {Colors.NEON_RED}▓{Colors.RESET} "
+                f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[ERROR]{Colors.RESET} "
+                f"{Colors.BRIGHT_BLACK}{str(e)[:30]}...{Colors.RESET}")
+
 def check_proxy_status():
     """
     Display cyberpunk‑styled diagnostics for the first few proxies
@@ -41,44 +74,10 @@ def check_proxy_status():
             print(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_CYAN}{idx:02d}{Colors.BRIGHT_BLACK}]{Colors.RESET} "
                   f"{Colors.BRIGHT_WHITE}Testing: {Colors.BRIGHT_YELLOW}{proxy}{Colors.RESET}")
 
-            # Animated spinner
-            spinner = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-            for i, ch in enumerate(spinner):
-                print(f"\r      {Colors.BRIGHT_CYAN}{ch}{Colors.RESET} {Colors.BRIGHT_WHITE}Connecting...{Colors.RESET}", end="", flush=True)
-                time.sleep(0.1)
-                if i > 8:
-                    break
-
-            proxy_dict = {
-                "http": f"http://{proxy}",
-                "https": f"http://{proxy}"
-            }
-
-            try:
-                r = requests.get("https://api.mail.tm", proxies=proxy_dict, timeout=5)
-                if r.status_code == 200:
-                    status_color = Colors.NEON_GREEN
-                    status_text = "[ONLINE]"
-                else:
-                    status_color = Colors.NEON_ORANGE
-                    status_text = "[DEGRADED]"
-                print(f"\r      {status_color}▓{Colors.RESET} "
-                      f"{Colors.BRIGHT_WHITE}Status: {status_color}{status_text}{Colors.RESET} "
-                      f"{Colors.BRIGHT_BLACK}Response: {status_color}{r.status_code}{Colors.RESET}")
-            except requests.exceptions.Timeout:
-                print(f"\r      {Colors.NEON_RED}▓{Colors.RESET} "
-                      f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[TIMEOUT]{Colors.RESET} "
-                      f"{Colors.BRIGHT_BLACK}Connection timed out{Colors.RESET}")
-            except requests.exceptions.ConnectionError:
-                print(f"\r      {Colors.NEON_RED}▓{Colors.RESET} "
-                      f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[OFFLINE]{Colors.RESET} "
-                      f"{Colors.BRIGHT_BLACK}Connection refused{Colors.RESET}")
-            except Exception as e:
-                print(f"\r      {Colors.NEON_RED}▓{Colors.RESET} "
-                      f"{Colors.BRIGHT_WHITE}Status: {Colors.NEON_RED}[ERROR]{Colors.RESET} "
-                      f"{Colors.BRIGHT_BLACK}{str(e)[:30]}...{Colors.RESET}")
-
-            print()
+            # The render thread animates the spinner while the request is in flight
+            terminal.spinner("proxy", f"{Colors.BRIGHT_WHITE}Connecting...{Colors.RESET}", prefix="      ")
+            terminal.remove_line("proxy", final=probe_proxy(proxy) + "\n")
+            terminal.flush()
 
     cyberpunk_footer()
     wait_for_key()
@@ -0,0 +1,49 @@
+import time
+
+from colors import Colors
+from ui import cyberpunk_header, cyberpunk_input_prompt
+import message_cache
+
+# Results listed per query
+RESULT_LIMIT = 20
+
+def display_search_results(results):
+    """Print ranked search hits with account, sender, subject and matching snippet."""
+    print(f"\n{Colors.BRIGHT_CYAN}{'#':<3} {'ACCOUNT':<26} {'FROM':<20} {'SUBJECT':<30} {'DATE':<12}{Colors.RESET}")
+    print(f"{Colors.BRIGHT_BLACK}{'-'*94}{Colors.RESET}")
+    for index, (account, message, snippet) in enumerate(results, 1):
+        sender = message.get('from', {})
+        from_name = (sender.get('name') or sender.get('address', 'Unknown'))[:20]
+        subject = (message.get('subject') or 'No Subject')[:30]
+        date_str = message.get('createdAt', '')
+        date_str = date_str[5:10] + " " + date_str[11:16]
+        print(f"{Colors.BRIGHT_YELLOW}{index:<3}{Colors.RESET} {Colors.BRIGHT_MAGENTA}{account[:26]:<26}{Colors.RESET} "
+              f"{Colors.BRIGHT_CYAN}{from_name:<20}{Colors.RESET} {Colors.BRIGHT_WHITE}{subject:<30}{Colors.RESET} "
+              f"{Colors.BRIGHT_YELLOW}{date_str:<12}{Colors.RESET}")
+        if snippet:
+            print(f"    {Colors.BRIGHT_BLACK}{' '.join(snippet.split())[:88]}{Colors.RESET}")
+
+def search_messages_menu():
+    """
+    Ranked local full-text search over subject, sender and body of every
+    cached message. Runs entirely against messages.db; no API calls.
+    """
+    cyberpunk_header("MESSAGE SEARCH", Colors.BRIGHT_CYAN)
+    print(f"\n{Colors.BRIGHT_BLACK}Words must all match; end a word with * for a prefix search (e.g. verif*){Colors.RESET}")
+
+    while True:
+        query = cyberpunk_input_prompt("SEARCH QUERY (or '<' to go back)", Colors.BRIGHT_CYAN).strip()
+        if query == '<':
+            return
+        if not query:
+            continue
+
+        started = time.perf_counter()
+        results = message_cache.search_messages(query, RESULT_LIMIT)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if results:
+            display_search_results(results)
+        else:
+            print(f"\n{Colors.BRIGHT_YELLOW}No cached messages match '{query}'{Colors.RESET}")
+        print(f"\n{Colors.BRIGHT_BLACK}{len(results)} results in {elapsed:.1f} ms{Colors.RESET}\n")
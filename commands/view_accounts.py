@@ -1,46 +1,88 @@
-import time
 from colors import Colors
-from effects import clear_screen, wait_for_key
-from ui import cyberpunk_header
+from effects import clear_screen, wait_for_key, getch
+from ui import cyberpunk_header, cyberpunk_input_prompt
+from progress import format_cyberpunk_progress_bar
+import account_store
+import account_health
+import terminal
+import rate_limit
 
-ACCOUNTS_FILE = "accounts.txt"
+# Records rendered per screen; only this window is ever read from disk
+PAGE_SIZE = 20
 
-def view_accounts_menu():
+# Health status -> (label, color) shown in the STATUS column
+STATUS_LABELS = {
+    "valid": ("[VALID]", Colors.BRIGHT_GREEN),
+    "bad_credentials": ("[BAD AUTH]", Colors.NEON_RED),
+    "deleted": ("[DELETED]", Colors.NEON_RED),
+    "disabled": ("[DISABLED]", Colors.BRIGHT_YELLOW),
+    "error": ("[ERROR]", Colors.BRIGHT_YELLOW),
+}
+
+def format_status(health):
     """
-    Display stored accounts in a cyberpunk‑styled table.
+    STATUS and QUOTA cells for a stored health row. Stale results keep
+    their label but are dimmed and marked with '?'.
     """
-    clear_screen()
-    cyberpunk_header("DATABASE ACCESS", Colors.BRIGHT_BLUE)
+    if health is None:
+        return f"{Colors.BRIGHT_BLACK}{'[UNCHECKED]':<12}{Colors.RESET}", f"{'':>6}"
+    label, color = STATUS_LABELS.get(health["status"], ("[UNKNOWN]", Colors.BRIGHT_YELLOW))
+    if account_health.is_stale(health):
+        label, color = label + "?", Colors.BRIGHT_BLACK
+    quota = ""
+    if health["quota"]:
+        quota = f"{100 * (health['used'] or 0) / health['quota']:.1f}%"
+    return f"{color}{label:<12}{Colors.RESET}", f"{Colors.BRIGHT_BLACK}{quota:>6}{Colors.RESET}"
 
-    try:
-        with open(ACCOUNTS_FILE, "r") as f:
-            lines = [line.strip() for line in f if line.strip()]
-    except FileNotFoundError:
-        print(f"\n{Colors.BRIGHT_RED}[ERROR]{Colors.RESET} "
-              f"{Colors.BRIGHT_WHITE}No account database found ({ACCOUNTS_FILE}){Colors.RESET}\n")
-        print(f"{Colors.BRIGHT_YELLOW}[SUGGESTION]{Colors.RESET} "
-              f"{Colors.BRIGHT_WHITE}Initialize accounts first{Colors.RESET}\n")
-        wait_for_key()
-        return
+def read_page(page, pages, total, prefix="", shown=None, shown_page=None):
+    """
+    Read the accounts of `page`. Redrawing the page on screen (`shown`,
+    page number `shown_page`) or moving one page from it, and the first
+    and last pages, use keyset paging, so their cost does not grow with
+    the table. Other jumps skip rows from the nearer end of the listing.
+    """
+    if shown and abs(page - shown_page) <= 1:
+        if page == shown_page:
+            return account_store.page_from(account_store.sort_key(shown[0], prefix), PAGE_SIZE, prefix,
+                                           inclusive=True)
+        if page > shown_page:
+            return account_store.page_from(account_store.sort_key(shown[-1], prefix), PAGE_SIZE, prefix)
+        return account_store.page_from(account_store.sort_key(shown[0], prefix), PAGE_SIZE, prefix,
+                                       backward=True)
+    offset = (page - 1) * PAGE_SIZE
+    if page == 1:
+        return account_store.page_from(None, PAGE_SIZE, prefix)
+    if page == pages:
+        return account_store.page_from(None, total - offset, prefix, backward=True)
+    if offset > total // 2:
+        return account_store.page_accounts(total - offset - PAGE_SIZE, PAGE_SIZE, prefix, from_end=True)
+    return account_store.page_accounts(offset, PAGE_SIZE, prefix)
 
-    if not lines:
-        print(f"\n{Colors.BRIGHT_YELLOW}[WARNING]{Colors.RESET} "
-              f"{Colors.BRIGHT_WHITE}No records to display{Colors.RESET}\n")
-        wait_for_key()
-        return
+def render_accounts_page(page, prefix="", shown=None, shown_page=None):
+    """
+    Read and draw a single page of accounts with their last stored health
+    status. `shown` and `shown_page` are the rows and number of the page
+    currently on screen, see read_page(). Returns (page, pages, accounts)
+    so the caller can clamp navigation and refresh the rows shown.
+    """
+    total = account_store.count_accounts(prefix)
+    pages = max(1, (total + PAGE_SIZE - 1) // PAGE_SIZE)
+    page = min(max(page, 1), pages)
+    offset = (page - 1) * PAGE_SIZE
+    accounts = read_page(page, pages, total, prefix, shown, shown_page)
+    health = account_store.get_health(a['address'] for a in accounts)
+
+    clear_screen()
+    cyberpunk_header("DATABASE ACCESS", Colors.BRIGHT_BLUE)
 
     # Header row
-    print(f"\n{Colors.BRIGHT_BLACK}{'='*80}{Colors.RESET}")
-    print(f"{Colors.BRIGHT_WHITE}{'ID':<4} {'EMAIL':<40} {'PASSWORD':<20} {'STATUS':<10}{Colors.RESET}")
-    print(f"{Colors.BRIGHT_BLACK}{'='*80}{Colors.RESET}")
+    print(f"\n{Colors.BRIGHT_BLACK}{'='*90}{Colors.RESET}")
+    print(f"{Colors.BRIGHT_WHITE}{'ID':<7} {'EMAIL':<40} {'PASSWORD':<20} {'STATUS':<12} {'QUOTA':>6}{Colors.RESET}")
+    print(f"{Colors.BRIGHT_BLACK}{'='*90}{Colors.RESET}")
 
     # Display each record with alternating colors
-    for idx, entry in enumerate(lines, start=1):
-        try:
-            email, password = entry.split(" | ")
-        except ValueError:
-            email = entry
-            password = ""
+    lines = []
+    for idx, account in enumerate(accounts, start=offset + 1):
         if idx % 2 == 0:
             id_col    = Colors.BRIGHT_CYAN
             email_col = Colors.BRIGHT_WHITE
@@ -50,15 +92,123 @@ def view_accounts_menu():
             email_col = Colors.BRIGHT_GREEN
             pass_col  = Colors.BRIGHT_RED
 
-        status_col = Colors.BRIGHT_GREEN
-        status_txt = "[ACTIVE]"
+        status, quota = format_status(health.get(account['address'].lower()))
+
+        lines.append(f"{id_col}{idx:<7}{Colors.RESET} "
+                     f"{email_col}{account['address']:<40}{Colors.RESET} "
+                     f"{pass_col}{account['password']:<20}{Colors.RESET} "
+                     f"{status} {quota}")
+    if lines:
+        print("\n".join(lines))
+    else:
+        print(f"{Colors.BRIGHT_YELLOW}No records match '{prefix}'{Colors.RESET}")
+
+    print(f"{Colors.BRIGHT_BLACK}{'='*90}{Colors.RESET}")
+    search = f" | {Colors.BRIGHT_WHITE}search: {Colors.BRIGHT_CYAN}{prefix}{Colors.BRIGHT_BLACK}" if prefix else ""
+    print(f"{Colors.BRIGHT_BLACK}Page {Colors.BRIGHT_WHITE}{page}/{pages}{Colors.BRIGHT_BLACK} | "
+          f"{Colors.BRIGHT_WHITE}{total}{Colors.BRIGHT_BLACK} records{search}{Colors.RESET}")
+    return page, pages, accounts
+
+def check_all_accounts():
+    """Health-check every stored account with one progress bar, after confirming."""
+    total = account_store.count_accounts()
+    # Two API calls per account at the shared request rate
+    estimate = 2 * total / rate_limit.RATE if rate_limit.RATE > 0 else 0
+    confirm = cyberpunk_input_prompt(f"CHECK ALL {total} ACCOUNTS (~{estimate / 60:.0f} min)? (y/N)",
+                                     Colors.BRIGHT_YELLOW)
+    if confirm.strip().lower() != 'y':
+        return
+    counts = {}
+
+    def on_result(address, result):
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+        terminal.set_line("health", f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}HEALTH]{Colors.RESET} "
+                                    f"{format_cyberpunk_progress_bar(sum(counts.values()), total, 30)}")
+
+    try:
+        account_health.check_accounts(account_store.iter_accounts(), on_result=on_result)
+    finally:
+        terminal.remove_line("health")
+        terminal.flush()
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"\n{Colors.BRIGHT_GREEN}[DONE]{Colors.RESET} {Colors.BRIGHT_WHITE}{summary or 'nothing checked'}{Colors.RESET}")
+    wait_for_key()
+
+def incremental_search(prefix):
+    """
+    Narrow the listing by address prefix one keystroke at a time.
+    Enter keeps the filter, Esc clears it.
+    """
+    while True:
+        render_accounts_page(1, prefix)
+        print(f"\n{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_BLUE}/{Colors.BRIGHT_BLACK}]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}SEARCH ADDRESS (Enter to keep, Esc to clear){Colors.RESET} "
+              f"{Colors.BRIGHT_BLUE}►{Colors.RESET} {prefix}", end='', flush=True)
+        ch = getch()
+        if ch in ('\r', '\n'):
+            return prefix
+        if ch == '\x1b':
+            return ""
+        if ch == '\x03':
+            raise KeyboardInterrupt
+        if ch in ('\x08', '\x7f'):
+            prefix = prefix[:-1]
+        elif ch.isprintable():
+            prefix += ch
+
+def view_accounts_menu():
+    """
+    Browse stored accounts one page at a time with paging, jump-to-page
+    and incremental search by address. Rows show their stored health
+    status at once; stale ones on the current page are re-checked in the
+    background.
+    """
+    if not account_store.count_accounts():
+        clear_screen()
+        cyberpunk_header("DATABASE ACCESS", Colors.BRIGHT_BLUE)
+        print(f"\n{Colors.BRIGHT_YELLOW}[WARNING]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}No records to display{Colors.RESET}\n")
+        print(f"{Colors.BRIGHT_YELLOW}[SUGGESTION]{Colors.RESET} "
+              f"{Colors.BRIGHT_WHITE}Initialize accounts first{Colors.RESET}\n")
+        wait_for_key()
+        return
 
-        print(f"{id_col}{idx:<4}{Colors.RESET} "
-              f"{email_col}{email:<40}{Colors.RESET} "
-              f"{pass_col}{password:<20}{Colors.RESET} "
-              f"{status_col}{status_txt}{Colors.RESET}")
-        time.sleep(0.02)
+    def on_refreshed(results):
+        # Runs on the refresh thread while the prompt is open
+        terminal.post(f"{Colors.BRIGHT_BLACK}[{Colors.BRIGHT_GREEN}HEALTH]{Colors.RESET} "
+                      f"{Colors.BRIGHT_WHITE}{len(results)} statuses updated, press R to redraw{Colors.RESET}")
 
-    print(f"{Colors.BRIGHT_BLACK}{'='*80}{Colors.RESET}\n")
+    page = 1
+    prefix = ""
+    accounts, shown_page = None, None
+    cancel_refresh = lambda: None
+    while True:
+        cancel_refresh()
+        page, pages, accounts = render_accounts_page(page, prefix, accounts, shown_page)
+        shown_page = page
+        cancel_refresh = account_health.start_background_refresh(accounts, on_refreshed)
+        print(f"\n  {Colors.BRIGHT_GREEN}[N]{Colors.RESET} Next  "
+              f"{Colors.BRIGHT_GREEN}[P]{Colors.RESET} Prev  "
+              f"{Colors.BRIGHT_GREEN}[/]{Colors.RESET} Search  "
+              f"{Colors.BRIGHT_GREEN}[R]{Colors.RESET} Redraw  "
+              f"{Colors.BRIGHT_GREEN}[H]{Colors.RESET} Check all  "
+              f"{Colors.BRIGHT_GREEN}[B]{Colors.RESET} Back  "
+              f"{Colors.BRIGHT_YELLOW}or a page number{Colors.RESET}")
 
-    wait_for_key()
\ No newline at end of file
+        action = cyberpunk_input_prompt("SELECT ACTION", Colors.BRIGHT_YELLOW).strip().upper()
+        if action.isdigit():
+            page = int(action)
+        elif action in ('N', ''):
+            page = page + 1 if page < pages else page
+        elif action == 'P':
+            page -= 1
+        elif action == '/':
+            prefix = incremental_search(prefix)
+            page = 1
+            accounts = None
+        elif action == 'H':
+            cancel_refresh()
+            check_all_accounts()
+        elif action == 'B':
+            cancel_refresh()
+            return
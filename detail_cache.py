@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+
+# Upper bound on the summed size of cached message bodies
+MAX_BYTES = 8 * 1024 * 1024
+
+_entries = OrderedDict()  # message id -> (details, size in bytes)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+def get(message_id):
+    """Return cached details for `message_id` (marking it recently used), or None."""
+    with _lock:
+        entry = _entries.get(message_id)
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(message_id)
+        _stats["hits"] += 1
+        return entry[0]
+
+def contains(message_id):
+    """True if `message_id` is cached. Does not touch LRU order or counters."""
+    with _lock:
+        return message_id in _entries
+
+def put(message_id, details, size):
+    """
+    Cache `details` accounted as `size` bytes, evicting least recently
+    used entries until the total fits in MAX_BYTES.
+    """
+    if size > MAX_BYTES:
+        return
+    with _lock:
+        old = _entries.pop(message_id, None)
+        if old is not None:
+            _stats["bytes"] -= old[1]
+        _entries[message_id] = (details, size)
+        _stats["bytes"] += size
+        while _stats["bytes"] > MAX_BYTES:
+            _, (_, evicted_size) = _entries.popitem(last=False)
+            _stats["bytes"] -= evicted_size
+            _stats["evictions"] += 1
+
+def discard(message_id):
+    """Drop `message_id` from the cache if present."""
+    with _lock:
+        entry = _entries.pop(message_id, None)
+        if entry is not None:
+            _stats["bytes"] -= entry[1]
+
+def stats():
+    """Return a snapshot of hit/miss/eviction counters and current usage."""
+    with _lock:
+        return dict(_stats, entries=len(_entries), max_bytes=MAX_BYTES)
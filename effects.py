@@ -1,31 +1,114 @@
 import time
 import random
-import threading
 import os
+import sys
 import shutil
+import math
+from functools import lru_cache
+from itertools import accumulate
 from colors import Colors
 
+# Upper bound on animation frames drawn per second
+FRAME_RATE = 30
+
+# Precomputed color tables so effects index instead of formatting per character
+RAINBOW_COLORS = (Colors.RED, Colors.YELLOW, Colors.GREEN, Colors.CYAN, Colors.BLUE, Colors.MAGENTA)
+GLITCH_CHARS = "█▓▒░▄▀■□▪▫"
+GLITCH_CELLS = tuple(f"{Colors.BRIGHT_RED}{ch}{Colors.RESET}" for ch in GLITCH_CHARS)
+
+# Matrix rain cells and cumulative weights: 10% of columns hold a drop,
+# 30% of drops are colored green or white
+_RAIN_CHARS = "01█▓▒░"
+_RAIN_COLORS = (Colors.GREEN, Colors.BRIGHT_GREEN, Colors.BRIGHT_WHITE)
+RAIN_CELLS = ((" ",) + tuple(_RAIN_CHARS)
+              + tuple(f"{color}{ch}{Colors.RESET}" for ch in _RAIN_CHARS for color in _RAIN_COLORS))
+RAIN_WEIGHTS = tuple(accumulate(
+    (0.9,) + (0.1 * 0.7 / len(_RAIN_CHARS),) * len(_RAIN_CHARS)
+    + (0.1 * 0.3 / (len(_RAIN_CHARS) * len(_RAIN_COLORS)),) * (len(_RAIN_CHARS) * len(_RAIN_COLORS))
+))
+# Cells drawn once up front; each rain frame is a random window into this
+RAIN_POOL_SIZE = 8192
+_rain_pool = []
+
 def clear_screen():
     """Clear the terminal screen."""
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def getch():
+    """Get a single character from stdin, cross-platform version"""
+    try:
+        # For Windows
+        import msvcrt
+        return msvcrt.getch().decode('utf-8')
+    except ImportError:
+        # For Unix
+        import tty, termios
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setraw(fd)
+            ch = sys.stdin.read(1)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        return ch
+
+def write_frame(frame):
+    """Write a whole frame to the terminal in a single write call."""
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        return
+    # Anything already printed through the text layer goes out first
+    sys.stdout.flush()
+    out.write(frame.encode(sys.stdout.encoding or "utf-8", "replace"))
+    out.flush()
+
+def play_frames(render, duration, fps=FRAME_RATE):
+    """
+    Draw render(index) for frame indices 0.. over `duration` seconds, at
+    most `fps` frames per second. When drawing falls behind (a slow
+    terminal, a busy CPU), late frames are skipped instead of drawn back
+    to back. Returns the number of frames actually drawn.
+    """
+    interval = 1.0 / fps
+    frames = max(1, int(duration * fps))
+    start = time.perf_counter()
+    index = drawn = 0
+    while index < frames:
+        write_frame(render(index))
+        drawn += 1
+        index = max(index + 1, int((time.perf_counter() - start) / interval))
+        delay = start + index * interval - time.perf_counter()
+        if delay > 0 and index < frames:
+            time.sleep(delay)
+    return drawn
+
 def typewriter_effect(text, delay=0.03):
-    """Print text with a typewriter effect."""
-    for char in text:
-        print(char, end='', flush=True)
-        time.sleep(delay)
-    print()
+    """Print text with a typewriter effect, writing whatever is due once per frame."""
+    if not text:
+        print()
+        return
+    interval = max(delay, 1.0 / FRAME_RATE)
+    shown = [0]
+
+    def render(index):
+        due = min(len(text), int(index * interval / delay) + 1)
+        chunk = text[shown[0]:due]
+        shown[0] = due
+        return chunk
 
+    play_frames(render, len(text) * delay, fps=1.0 / interval)
+    write_frame(text[shown[0]:] + "\n")
+
+@lru_cache(maxsize=64)
 def rainbow_text(text):
     """Return text colored in a repeating rainbow pattern."""
-    colors = [Colors.RED, Colors.YELLOW, Colors.GREEN, Colors.CYAN, Colors.BLUE, Colors.MAGENTA]
-    result = ""
-    for i, char in enumerate(text):
-        if char != " ":
-            result += colors[i % len(colors)] + char
-        else:
-            result += char
-    return result + Colors.RESET
+    n = len(RAINBOW_COLORS)
+    return "".join(
+        char if char == " " else RAINBOW_COLORS[i % n] + char
+        for i, char in enumerate(text)
+    ) + Colors.RESET
 
 def glow_effect(text, color=Colors.CYAN):
     """Wrap text in a glowing bullet-style effect."""
@@ -78,36 +161,36 @@ def glitch_text(text, intensity=0.1):
     Introduce random glitch characters into `text`.
     intensity=0.1 means ~10% of chars get replaced by █▓▒░▄▀■□▪▫ in red.
     """
-    glitch_chars = "█▓▒░▄▀■□▪▫"
-    result = ""
-    for ch in text:
-        if ch != " " and random.random() < intensity:
-            result += f"{Colors.BRIGHT_RED}{random.choice(glitch_chars)}{Colors.RESET}"
-        else:
-            result += ch
-    return result
+    if intensity <= 0 or not text:
+        return text
+    if intensity >= 1:
+        return "".join(ch if ch == " " else random.choice(GLITCH_CELLS) for ch in text)
+    # Jump straight to the next glitched position (geometric gaps) instead
+    # of rolling a random number for every character
+    cells = list(text)
+    log_keep = math.log(1 - intensity)
+    i = int(math.log(1 - random.random()) / log_keep)
+    while i < len(cells):
+        if cells[i] != " ":
+            cells[i] = random.choice(GLITCH_CELLS)
+        i += 1 + int(math.log(1 - random.random()) / log_keep)
+    return "".join(cells)
 
 def matrix_rain_effect(duration=1, width=90):
     """
     Quick 'Matrix'-style rain for `duration` seconds.
     Prints random 0/1/blocks columns that scroll once.
     """
-    chars = "01█▓▒░"
-    iterations = int(duration * 10)
-    for _ in range(iterations):
-        line = "".join(
-            random.choice(chars) if random.random() < 0.1 else " "
-            for _ in range(width)
-        )
-        # randomly color some drops green or white
-        colored = "".join(
-            f"{random.choice([Colors.GREEN, Colors.BRIGHT_GREEN, Colors.BRIGHT_WHITE])}{c}{Colors.RESET}"
-            if c != " " and random.random() < 0.3 else c
-            for c in line
-        )
-        print(f"\r{colored}", end='', flush=True)
-        time.sleep(0.1)
-    print("\r" + " " * width + "\r", end='', flush=True)
+    if not _rain_pool:
+        _rain_pool.extend(random.choices(RAIN_CELLS, cum_weights=RAIN_WEIGHTS, k=RAIN_POOL_SIZE))
+    width = min(width, RAIN_POOL_SIZE)
+
+    def render(index):
+        offset = random.randrange(RAIN_POOL_SIZE - width + 1)
+        return "\r" + "".join(_rain_pool[offset:offset + width])
+
+    play_frames(render, duration, fps=10)
+    write_frame("\r" + " " * width + "\r")
 
 def wait_for_key(prompt="Press Enter to continue", centered=False):
     """
@@ -127,25 +210,13 @@ def wait_for_key(prompt="Press Enter to continue", centered=False):
     else:
         padding = ""
     
-    spinner = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-    stop_flag = False
-
-    def animate():
-        i = 0
-        while not stop_flag:
-            ch = spinner[i % len(spinner)]
-            # Apply padding for centering
-            print(f"\r{padding}{Colors.BRIGHT_CYAN}{ch}{Colors.RESET} {prompt}", end='', flush=True)
-            time.sleep(0.1)
-            i += 1
-
-    thread = threading.Thread(target=animate, daemon=True)
-    thread.start()
+    # The spinner is drawn by the terminal render thread while input() blocks
+    import terminal
+    terminal.spinner("wait_for_key", prompt, prefix=padding)
     try:
         input()
     except KeyboardInterrupt:
         pass
     finally:
-        stop_flag = True
-        # Clear the entire line
-        print("\r" + " " * term_width + "\r", end='', flush=True)
\ No newline at end of file
+        terminal.remove_line("wait_for_key")
+        terminal.flush()
\ No newline at end of file
@@ -0,0 +1,42 @@
+import html
+import re
+from functools import lru_cache
+
+# Tags that start a new line in the text rendering
+BLOCK_TAGS = ("p", "div", "br", "tr", "ul", "ol", "table", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6", "hr", "section", "article", "header", "footer")
+
+_SKIP = re.compile(r"<(script|style|head|title)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_LINK = re.compile(r"""<a\s[^>]*?href\s*=\s*["'](https?://[^"']+)["'][^>]*>(.*?)</a\s*>""",
+                   re.IGNORECASE | re.DOTALL)
+_LIST_ITEM = re.compile(r"<li\b[^>]*>", re.IGNORECASE)
+_BLOCK = re.compile(r"</?(?:%s)\b[^>]*>" % "|".join(BLOCK_TAGS), re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+@lru_cache(maxsize=32)
+def html_to_text(source):
+    """
+    Render an HTML body as plain text for the terminal: scripts and
+    styles dropped, line breaks at block tags, link targets in brackets.
+    A handful of regex passes rather than a full parse, so megabyte
+    newsletters convert quickly; results are cached, so reopening a
+    message does not convert it again.
+    """
+    text = _SKIP.sub("", source)
+    # Source line breaks are just whitespace in HTML
+    text = text.replace("\r", " ").replace("\n", " ")
+    text = _LINK.sub(lambda m: f"{m.group(2)} [{m.group(1)}]", text)
+    text = _LIST_ITEM.sub("\n- ", text)
+    text = _BLOCK.sub("\n", text)
+    text = html.unescape(_TAG.sub("", text))
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    # Collapse runs of blank lines left by nested blocks
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def message_text(message):
+    """The text body of a mail.tm message, falling back to its HTML parts."""
+    if message.get("text"):
+        return message["text"]
+    html = message.get("html") or []
+    return html_to_text("".join(html) if isinstance(html, list) else html)
@@ -0,0 +1,63 @@
+"""
+Cold-start import profile, a built-in version of `python -X importtime`.
+
+The target module is imported in a fresh interpreter so the numbers match
+a real launch, not whatever this process has already loaded.
+"""
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules worth timing: the headless CLI and the interactive menu
+TARGETS = ("cli", "main")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def measure(module):
+    """
+    Import `module` in a child interpreter and return a dict with the total
+    import time in microseconds and one row per module imported:
+    (name, depth, self_us, cumulative_us), in completion order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        # Everything before `site` finishes is interpreter startup, not ours
+        if name == "site" and depth == 0:
+            rows = []
+            continue
+        rows.append((name, depth, int(self_us), int(cumulative_us)))
+    total = sum(cumulative for _, depth, _, cumulative in rows if depth == 0)
+    return {"module": module, "total_us": total, "rows": rows}
+
+def by_package(report):
+    """Sum self time per top-level package, largest first."""
+    totals = {}
+    for name, _, self_us, _ in report["rows"]:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+def best_of(module, runs=5):
+    """Measure `module` `runs` times and keep the fastest, to damp disk and CPU noise."""
+    return min((measure(module) for _ in range(runs)), key=lambda r: r["total_us"])
+
+def format_report(report, top=15):
+    """Return the report as text: total, then the heaviest packages."""
+    lines = [f"import {report['module']}: {report['total_us'] / 1000:.1f} ms"]
+    for package, self_us in by_package(report)[:top]:
+        lines.append(f"  {self_us / 1000:8.1f} ms  {package}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+import requests
+from urllib.parse import urljoin
+
+from mailtm import BASE_URL, request, sign_in
+import message_cache
+import detail_cache
+
+def _error_detail(e, default):
+    """The API's `detail` message for a failed request, or a fallback."""
+    response = getattr(e, "response", None)
+    if response is None:
+        return str(e)
+    try:
+        return response.json().get("detail", default)
+    except (ValueError, AttributeError):
+        return f"{default} (HTTP {response.status_code})"
+
+def authenticate_email(email, password):
+    """Authenticate with Mail.tm API and return token (cached tokens are reused)"""
+    try:
+        return sign_in(email, password)
+    except requests.exceptions.RequestException as e:
+        error_msg = _error_detail(e, "Authentication failed")
+        raise Exception(f"Authentication error: {error_msg}")
+
+def fetch_pages(token, url=None):
+    """
+    Yield (messages, next_url) for each /messages page from `url` (the
+    first page by default), following hydra:view pagination lazily so
+    only one page is held in memory at a time. The token is sent with
+    each request rather than set on the shared session, so walks of
+    several accounts can run on different threads.
+    """
+    url = url or f"{BASE_URL}/messages"
+    headers = {"Authorization": f"Bearer {token}"}
+    while url:
+        try:
+            response = request("GET", url, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            error_msg = _error_detail(e, "Failed to fetch messages")
+            raise Exception(f"Fetch error: {error_msg}")
+        next_page = data.get("hydra:view", {}).get("hydra:next")
+        url = urljoin(BASE_URL, next_page) if next_page else None
+        yield data.get("hydra:member", []), url  # Correct key is "hydra:member"
+
+def fetch_emails(token):
+    """Yield message summaries of every page, newest first."""
+    for messages, _ in fetch_pages(token):
+        yield from messages
+
+def iter_new_messages(token, account):
+    """
+    Yield messages that are not cached yet, newest first, writing each
+    page to the cache before yielding it. The walk stops at the first
+    message that is already cached or older than the newest cached one.
+
+    Until an account has been walked down to its last page, the cache
+    may end above older mail (an interrupted first sync, or pages stored
+    by the monitor). The next page to fetch is kept as a cursor, and
+    later syncs resume from it, skipping cached messages, until the last
+    page is reached and the account is marked complete.
+    """
+    newest = message_cache.newest_created_at(account)
+    complete, cursor = message_cache.sync_state(account)
+    # A first sync keeps the cursor current as it walks down
+    first_sync = newest is None and not complete
+    for messages, next_url in fetch_pages(token):
+        fresh = []
+        for message in messages:
+            if message_cache.is_known(account, message['id']) or (
+                    newest and message.get('createdAt', '') < newest):
+                break
+            fresh.append(message)
+        message_cache.store_messages(account, fresh)
+        if first_sync:
+            message_cache.set_sync_state(account, next_url is None, next_url)
+        yield from fresh
+        if len(fresh) < len(messages):
+            break
+    else:
+        # Walked every page without meeting cached mail
+        message_cache.set_sync_state(account, True)
+        return
+    if complete or first_sync:
+        return
+
+    for messages, next_url in fetch_pages(token, cursor):
+        fresh = [m for m in messages if not message_cache.is_known(account, m['id'])]
+        message_cache.store_messages(account, fresh)
+        message_cache.set_sync_state(account, next_url is None, next_url)
+        yield from fresh
+
+def sync_inbox(token, account):
+    """Pull new messages into the local cache and return their ids"""
+    return {message['id'] for message in iter_new_messages(token, account)}
+
+def get_account_id(token):
+    """Return the mail.tm account id behind `token` (GET /me)"""
+    response = request("GET", f"{BASE_URL}/me", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    return response.json().get("id")
+
+def download_details(token, message_id):
+    """GET /messages/{id}, store it in the detail cache and index its body"""
+    response = request("GET", f"{BASE_URL}/messages/{message_id}",
+                       headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    details = response.json()
+    detail_cache.put(message_id, details, len(response.content))
+    if details.get('text'):
+        message_cache.index_body(message_id, details['text'])
+    return details
+
+def get_message_details(token, message_id):
+    """Get full message details, served from the detail cache when possible"""
+    details = detail_cache.get(message_id)
+    if details is not None:
+        return details
+    try:
+        return download_details(token, message_id)
+    except requests.exceptions.RequestException:
+        return None
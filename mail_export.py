@@ -0,0 +1,188 @@
+import mailbox
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin
+
+from mailtm import BASE_URL, request
+from inbox import authenticate_email, fetch_emails
+import account_store
+
+FORMATS = ("mbox", "maildir")
+# Raw sources downloaded at the same time; at most twice this many are
+# held in memory waiting to be written
+EXPORT_WORKERS = 4
+# Default folder for exports of all stored accounts
+EXPORT_DIR = "exports"
+# Message ids already written, one per line, next to the mbox/Maildir;
+# mbox lines also carry the file size after that message
+CHECKPOINT_SUFFIX = ".checkpoint"
+# Separator before the Maildir info ("2,S"); ':' is not allowed in
+# Windows file names, where mail clients expect '!' instead
+MAILDIR_COLON = "!" if os.name == "nt" else mailbox.Maildir.colon
+
+def checkpoint_path(target):
+    return target.rstrip("/\\") + CHECKPOINT_SUFFIX
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint file. Returns (ids, size): the message ids recorded
+    and the mbox size after the last complete message, or None if not
+    recorded. A last line cut off by an interruption is dropped from the
+    file, so later lines are not appended to it.
+    """
+    ids, size = set(), None
+    if not os.path.exists(path):
+        return ids, size
+    with open(path, "rb") as f:
+        data = f.read()
+    complete = 0
+    for line in data.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        complete += len(line)
+        message_id, _, offset = line.decode("utf-8").strip().partition("\t")
+        if message_id:
+            ids.add(message_id)
+        if offset.isdigit():
+            size = int(offset)
+    if complete < len(data):
+        with open(path, "r+b") as f:
+            f.truncate(complete)
+    return ids, size
+
+def fetch_source(token, message):
+    """Download the raw RFC 822 source of a message as bytes."""
+    path = message.get("downloadUrl") or f"/messages/{message['id']}/download"
+    response = request("GET", urljoin(BASE_URL + "/", path.lstrip("/")),
+                       headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    return response.content
+
+def _timestamp(message):
+    try:
+        return datetime.fromisoformat(message.get("createdAt", "")).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+def write_mbox(f, raw, message):
+    """Append one message to an open mbox file in mboxrd format."""
+    sender = (message.get("from") or {}).get("address") or "MAILER-DAEMON"
+    body = re.sub(rb"(?m)^(>*From )", rb">\1", raw.replace(b"\r\n", b"\n"))
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    f.write(f"From {sender} {time.asctime(time.gmtime(_timestamp(message)))}\n".encode())
+    f.write(body + b"\n")
+
+def write_maildir(root, raw, message):
+    """
+    Deliver one message into a Maildir. The file name is derived from the
+    message id, so writing the same message twice replaces it.
+    """
+    seen = message.get("seen")
+    name = f"{int(_timestamp(message))}.{message['id']}.cybermail" + (f"{MAILDIR_COLON}2,S" if seen else "")
+    tmp = os.path.join(root, "tmp", name)
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, os.path.join(root, "cur" if seen else "new", name))
+
+def export_account(token, target, fmt="mbox", workers=EXPORT_WORKERS, on_progress=None):
+    """
+    Stream every message of the signed-in account into `target` (an mbox
+    file or a Maildir folder). Sources are fetched on `workers` threads
+    and written in order by the caller's thread; each written id goes to
+    the checkpoint file, so a re-run skips what is already exported.
+    on_progress(exported, skipped, failed) is called after every message.
+    Returns (exported, skipped, failures) with failures a list of
+    (message, error).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format: {fmt}")
+    parent = os.path.dirname(os.path.abspath(target))
+    os.makedirs(parent, exist_ok=True)
+    if fmt == "maildir":
+        for sub in ("tmp", "new", "cur"):
+            os.makedirs(os.path.join(target, sub), exist_ok=True)
+    path = checkpoint_path(target)
+    done, size = load_checkpoint(path)
+    exported, skipped, failures = 0, 0, []
+    window = deque()
+
+    out = open(target, "ab") if fmt == "mbox" else None
+    checkpoint = open(path, "a", encoding="utf-8")
+    if out is not None:
+        if size is not None and out.tell() > size:
+            # Drop a message cut off by an interrupted run before appending
+            out.truncate(size)
+            out.seek(0, os.SEEK_END)
+        elif size is None:
+            # Record where this run starts, in case its first message is cut off
+            checkpoint.write(f"\t{out.tell()}\n")
+            checkpoint.flush()
+
+    def drain(limit):
+        nonlocal exported
+        while len(window) > limit:
+            message, future = window.popleft()
+            try:
+                raw = future.result()
+            except Exception as e:
+                failures.append((message, e))
+            else:
+                if out is not None:
+                    write_mbox(out, raw, message)
+                    out.flush()
+                    checkpoint.write(f"{message['id']}\t{out.tell()}\n")
+                else:
+                    write_maildir(target, raw, message)
+                    checkpoint.write(message["id"] + "\n")
+                checkpoint.flush()
+                exported += 1
+            if on_progress:
+                on_progress(exported, skipped, len(failures))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for message in fetch_emails(token):
+                if message["id"] in done:
+                    skipped += 1
+                    continue
+                window.append((message, executor.submit(fetch_source, token, message)))
+                drain(2 * workers)
+            drain(0)
+    finally:
+        if out is not None:
+            out.close()
+        checkpoint.close()
+    return exported, skipped, failures
+
+def account_target(address, fmt, dest_dir=EXPORT_DIR):
+    """Default export path of one account: <dest_dir>/<address>[.mbox]."""
+    name = re.sub(r'[<>:"/\\|?*]', "_", address)
+    return os.path.join(dest_dir, name + (".mbox" if fmt == "mbox" else ""))
+
+def export_all(fmt="mbox", dest_dir=EXPORT_DIR, workers=EXPORT_WORKERS, on_account=None, on_progress=None):
+    """
+    Export every stored account, one after another, to
+    account_target(address). on_account(address, target) announces each
+    account; on_progress(address, exported, skipped, failed) reports
+    progress. Returns {address: (exported, skipped, failures) or Exception}.
+    """
+    results = {}
+    for account in account_store.iter_accounts():
+        address = account["address"]
+        target = account_target(address, fmt, dest_dir)
+        if on_account:
+            on_account(address, target)
+        report = (lambda *counts: on_progress(address, *counts)) if on_progress else None
+        try:
+            token = authenticate_email(address, account["password"])
+            if not token:
+                raise Exception(f"No password or cached token for {address}")
+            results[address] = export_account(token, target, fmt, workers, report)
+        except Exception as e:
+            results[address] = e
+    return results
@@ -0,0 +1,252 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+import rate_limit
+import token_store
+
+# Point at a local stand-in (see standin_server.py) by setting MAILTM_BASE_URL
+BASE_URL = os.environ.get("MAILTM_BASE_URL", "https://api.mail.tm").rstrip("/")
+
+# Methods safe to send again after a 5xx; POST /token is also retried
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Connection pool sizing for the shared mail.tm session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_session = None
+# Passwords that authenticated in this session, by lowercased address,
+# kept in memory for automatic re-authentication
+_passwords = {}
+# Passwords given to sign_in that were not checked because a cached token
+# was used; tried only when no verified password is known
+_unverified = {}
+# Newest token of each account, and the account behind every token seen
+_current = {}
+_owners = {}
+# Serializes re-authentication so concurrent 401s refresh a token once
+_auth_lock = threading.Lock()
+
+def new_session():
+    """
+    Build a keep-alive requests.Session with a sized connection pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+def get_session():
+    """
+    Return the process-wide mail.tm session, creating it on first use.
+    Every API call goes through this so TCP+TLS handshakes are reused.
+    """
+    global _session
+    if _session is None:
+        _session = new_session()
+    return _session
+
+def set_token(token):
+    """
+    Attach a bearer token to the shared session. A token that has since
+    been replaced by a re-authentication is swapped for its account's
+    current one. The header is only rewritten when it actually changes.
+    """
+    session = get_session()
+    address = _owners.get(token)
+    if address:
+        token = _current.get(address, token)
+    header = f"Bearer {token}"
+    if session.headers.get("Authorization") != header:
+        session.headers["Authorization"] = header
+
+def clear_token():
+    """Drop the Authorization header from the shared session."""
+    get_session().headers.pop("Authorization", None)
+
+def close_session():
+    """Close the shared session and release its pooled connections."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+def authenticate(address, password):
+    """
+    POST /token and return the bearer token. Raises requests exceptions
+    on transport or HTTP errors.
+    """
+    response = send("POST", f"{BASE_URL}/token", retry_5xx=True,
+                    json={"address": address, "password": password})
+    response.raise_for_status()
+    return response.json().get("token")
+
+def _remember(address, token):
+    address = address.lower()
+    _current[address] = token
+    _owners[token] = address
+
+def get_token(address, password=None, force=False):
+    """
+    Return a bearer token for `address`, served from the token store
+    when a fresh one is cached. Without a password only the cache is used.
+    A password that authenticates is kept in memory for re-auth.
+    """
+    if not force:
+        token = token_store.cached_token(address)
+        if token:
+            _remember(address, token)
+            return token
+    if password is None:
+        return None
+    token = authenticate(address, password)
+    if token:
+        token_store.save_token(address, token)
+        _remember(address, token)
+        _passwords[address.lower()] = password
+    return token
+
+def sign_in(address, password=None):
+    """
+    Make `address` the active account on the shared session and return
+    its token. A password served by a cached token is not checked, so
+    it is only kept as a fallback for re-auth and never replaces one
+    that authenticated.
+    """
+    token = get_token(address, password)
+    if token:
+        if password is not None and address.lower() not in _passwords:
+            _unverified[address.lower()] = password
+        set_token(token)
+    return token
+
+def owner_of(token):
+    """Return the address a token was issued to, or None if unknown."""
+    return _owners.get(token) or token_store.address_for_token(token)
+
+def _reauthenticate(address, stale):
+    """
+    Replace `stale`, a token of `address` that is expiring or was
+    refused, and return the new token, or None without a known password.
+    When several calls fail with the same token at once, only the first
+    re-authenticates; the others get its result.
+    """
+    with _auth_lock:
+        current = _current.get(address)
+        if current and current != stale:
+            return current
+        password = _passwords.get(address)
+        if password is None:
+            password = _unverified.pop(address, None)
+            if password is None:
+                return None
+            try:
+                return get_token(address, password, force=True)
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 401:
+                    return None
+                # Not a verdict on the password; keep it for the next attempt
+                _unverified.setdefault(address, password)
+                raise
+        token_store.forget_token(address)
+        return get_token(address, password, force=True)
+
+def _bearer(headers):
+    header = headers.get("Authorization") or ""
+    return header[len("Bearer "):] if header.startswith("Bearer ") else None
+
+def _fresh_token(token):
+    """
+    The token to send in place of `token`: its account's current one if
+    it has since been replaced, re-issued shortly before it expires.
+    """
+    address = _owners.get(token)
+    if not address:
+        return token
+    current = _current.get(address, token)
+    if token_store.is_expiring(current) and (address in _passwords or address in _unverified):
+        current = _reauthenticate(address, current) or current
+    return current
+
+def current_token(token, refused=None):
+    """
+    The token to send for the account behind `token`, for connections
+    that outlive it: its newest one, re-issued shortly before expiry.
+    `refused` is a token the server just answered 401 for; if it is
+    still the newest, the account is re-authenticated.
+    """
+    if refused:
+        address = owner_of(refused)
+        if address:
+            return _reauthenticate(address, refused) or refused
+    return _fresh_token(token)
+
+def send(method, url, retry_5xx=None, **kwargs):
+    """
+    Send one call through the shared rate limiter. A 429 pauses every
+    caller for its Retry-After and is retried; a 5xx is retried with
+    jittered exponential backoff when `retry_5xx` (default: idempotent
+    methods only). Gives up after rate_limit.MAX_RETRIES and returns the
+    last response.
+    """
+    if retry_5xx is None:
+        retry_5xx = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        waited = rate_limit.acquire()
+        if waited:
+            metrics.record_throttle(method, url, waited)
+        response = metrics.timed(method, url, get_session().request, **kwargs)
+        status = response.status_code
+        if attempt >= rate_limit.MAX_RETRIES or not (status == 429 or (status >= 500 and retry_5xx)):
+            return response
+        delay = rate_limit.retry_after(response)
+        if status == 429:
+            rate_limit.pause(delay if delay is not None else rate_limit.backoff(attempt))
+        else:
+            delay = delay if delay is not None else rate_limit.backoff(attempt)
+            metrics.record_throttle(method, url, delay)
+            time.sleep(delay)
+        response.close()
+        metrics.record_retry(method, url)
+        attempt += 1
+
+def request(method, url, **kwargs):
+    """
+    Send a request on the shared session through send(). The bearer
+    token, from the caller's own Authorization header or else the
+    session, is swapped for its account's current one when it has been
+    replaced or is about to expire. A 401 re-authenticates the account
+    that owns the refused token and retries once. Tokens of unknown
+    accounts, or accounts without a known password, get the 401 back.
+    """
+    headers = kwargs.get("headers") or {}
+    own_auth = "Authorization" in headers
+    stale = _bearer(headers if own_auth else get_session().headers)
+    fresh = _fresh_token(stale) if stale else None
+    if fresh != stale:
+        if own_auth:
+            headers = kwargs["headers"] = dict(headers, Authorization=f"Bearer {fresh}")
+        else:
+            set_token(fresh)
+        stale = fresh
+    response = send(method, url, **kwargs)
+    if response.status_code != 401 or not stale:
+        return response
+    address = owner_of(stale)
+    token = _reauthenticate(address, stale) if address else None
+    if not token:
+        return response
+    if _bearer(get_session().headers) == stale:
+        set_token(token)
+    metrics.record_retry(method, url)
+    response.close()
+    kwargs["headers"] = dict(headers, Authorization=f"Bearer {token}")
+    return send(method, url, **kwargs)
@@ -1,24 +1,39 @@
 import sys
 import os
+
+# Headless subcommands (see cli.py) skip the animated UI and Rich entirely
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
+import importlib
+
 from startup import cyberpunk_startup
 from ui import display_main_menu, cyberpunk_input_prompt
-from commands.create_accounts import create_accounts_menu
-from commands.view_accounts import view_accounts_menu
-from commands.proxy_diagnostics import check_proxy_status
-from commands.show_about import show_about
-from commands.exit_sequence import cyberpunk_exit_sequence
-from commands.login_accounts import login_email_account_menu
-
-# Map menu selections to command functions
+
+# Map menu selections to (module, function). Command modules are imported
+# on first selection so startup only pays for the menu itself.
 PROTOCOLS = {
-    '1': create_accounts_menu,
-    '2': view_accounts_menu,
-    '3': check_proxy_status,
-    '4': login_email_account_menu,
-    '5': show_about,
-    '6': cyberpunk_exit_sequence,
+    '1': ("commands.create_accounts", "create_accounts_menu"),
+    '2': ("commands.view_accounts", "view_accounts_menu"),
+    '3': ("commands.proxy_diagnostics", "check_proxy_status"),
+    '4': ("commands.login_accounts", "login_email_account_menu"),
+    '5': ("commands.show_about", "show_about"),
+    '6': ("commands.exit_sequence", "cyberpunk_exit_sequence"),
+    '7': ("commands.monitor_accounts", "monitor_accounts_menu"),
+    '8': ("commands.search_messages", "search_messages_menu"),
+    '9': ("commands.api_diagnostics", "api_diagnostics_menu"),
+    '10': ("commands.export_archive", "export_archive_menu"),
 }
 
+def load_protocol(choice):
+    """Import the command module for `choice` and return its function, or None."""
+    target = PROTOCOLS.get(choice)
+    if target is None:
+        return None
+    module, function = target
+    return getattr(importlib.import_module(module), function)
+
 def main():
     """
     Boot the app, then enter the main loop:
@@ -40,10 +55,10 @@ def main():
 
             print("\n")
             # Get user choice
-            choice = cyberpunk_input_prompt("Select protocol (1-5):").strip()
+            choice = cyberpunk_input_prompt(f"Select protocol (1-{len(PROTOCOLS)}):").strip()
 
             # Lookup and run the corresponding function
-            action = PROTOCOLS.get(choice)
+            action = load_protocol(choice)
             if action:
                 action()
             else:
@@ -51,7 +66,7 @@ def main():
                 print(f"\nInvalid choice: {choice}. Please enter a number between 1 and {len(PROTOCOLS)}.\n")
     except KeyboardInterrupt:
         # Graceful shutdown on Ctrl+C
-        cyberpunk_exit_sequence()
+        load_protocol('6')()
     # except Exception as e:
     #     # Catch-all error handler
     #     print(f"\nUnexpected error: {e}\n")
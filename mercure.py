@@ -0,0 +1,134 @@
+import json
+import os
+import socket
+import threading
+
+import requests
+
+from mailtm import new_session
+import metrics
+
+MERCURE_URL = os.environ.get("MAILTM_MERCURE_URL", "https://mercure.mail.tm/.well-known/mercure")
+# Seconds to wait before reconnecting, unless the server sends `retry:`
+RECONNECT_DELAY = 3.0
+# Read timeout on the event stream; a silent stream is reopened after this
+STREAM_TIMEOUT = 90
+# Consecutive 401s after which a subscription gives up
+MAX_AUTH_FAILURES = 3
+
+def iter_sse_events(lines):
+    """
+    Parse Server-Sent Events from an iterable of text lines.
+    Yields dicts with `id`, `event`, `data` and `retry` keys.
+    """
+    event = {"id": None, "event": "message", "data": [], "retry": None}
+    for line in lines:
+        if line is None:
+            continue
+        line = line.rstrip("\r")
+        if not line:
+            # Blank line dispatches the buffered event; `id` and `retry`
+            # still count when no data was sent
+            if event["data"] or event["id"] is not None or event["retry"] is not None:
+                yield dict(event, data="\n".join(event["data"]))
+            event = {"id": None, "event": "message", "data": [], "retry": None}
+            continue
+        if line.startswith(":"):
+            continue  # comment / heartbeat
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            event["data"].append(value)
+        elif field == "id":
+            event["id"] = value
+        elif field == "event":
+            event["event"] = value
+        elif field == "retry" and value.isdigit():
+            event["retry"] = int(value) / 1000
+
+def subscribe(topic, token, on_event, url=None, last_event_id=None, on_error=None):
+    """
+    Follow a Mercure topic in a background daemon thread.
+
+    `on_event` is called with the decoded JSON payload of every update.
+    Dropped streams are reopened with Last-Event-ID so no update is missed.
+    `token` is a bearer token, or a callable token(refused) asked for the
+    token before every connection, with the token just refused by a 401
+    or None; mailtm.current_token fits, so reconnects follow re-issued
+    tokens. After MAX_AUTH_FAILURES 401s in a row the subscription ends
+    and on_error(message) is called.
+    Returns a `stop()` callable that ends the subscription.
+    """
+    url = url or MERCURE_URL
+    provide = token if callable(token) else (lambda refused: token)
+    stopped = threading.Event()
+    state = {"last_id": last_event_id, "delay": RECONNECT_DELAY, "response": None}
+    session = new_session()
+    session.headers.update({"Accept": "text/event-stream"})
+
+    def run():
+        refused = None
+        failures = 0
+        while not stopped.is_set():
+            sent = provide(refused)
+            headers = {"Authorization": f"Bearer {sent}"}
+            if state["last_id"]:
+                headers["Last-Event-ID"] = state["last_id"]
+            try:
+                # Recorded latency is time to the stream's headers, not its lifetime
+                with metrics.timed("GET", url, session.request, params={"topic": topic}, headers=headers,
+                                   stream=True, timeout=(10, STREAM_TIMEOUT)) as response:
+                    state["response"] = response
+                    if response.status_code == 401:
+                        refused = sent
+                        failures += 1
+                        if failures >= MAX_AUTH_FAILURES:
+                            break
+                    else:
+                        refused = None
+                        failures = 0
+                    response.raise_for_status()
+                    lines = response.iter_lines(chunk_size=None, decode_unicode=True)
+                    for event in iter_sse_events(lines):
+                        if event["id"]:
+                            state["last_id"] = event["id"]
+                        if event["retry"]:
+                            state["delay"] = event["retry"]
+                        if not event["data"]:
+                            continue
+                        try:
+                            payload = json.loads(event["data"])
+                        except ValueError:
+                            continue
+                        on_event(payload)
+                        if stopped.is_set():
+                            break
+            except (requests.exceptions.RequestException, AttributeError, ValueError):
+                # Network drop, timeout, or stream closed by stop()
+                pass
+            finally:
+                state["response"] = None
+            stopped.wait(state["delay"])
+        session.close()
+        if failures >= MAX_AUTH_FAILURES and not stopped.is_set() and on_error:
+            on_error(f"token refused {failures} times in a row")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    def stop():
+        stopped.set()
+        response = state["response"]
+        if response is not None:
+            # Closing the response would wait for the reader thread's
+            # buffer lock; shutting the socket down wakes the blocked read
+            conn = getattr(response.raw, "connection", None) or getattr(response.raw, "_connection", None)
+            sock = getattr(conn, "sock", None)
+            try:
+                if sock is not None:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    return stop
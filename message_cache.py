@@ -0,0 +1,258 @@
+import json
+import re
+import sqlite3
+import threading
+
+MESSAGE_DB = "messages.db"
+
+_conn = None
+_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    account    TEXT NOT NULL,
+    id         TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    seen       INTEGER NOT NULL DEFAULT 0,
+    data       TEXT NOT NULL,
+    body       TEXT,
+    PRIMARY KEY (account, id)
+);
+CREATE INDEX IF NOT EXISTS idx_messages_account_created
+    ON messages (account, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_messages_id ON messages (id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account  TEXT PRIMARY KEY,
+    complete INTEGER NOT NULL DEFAULT 0,
+    cursor   TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS message_index USING fts5(
+    subject, sender, body,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3 4'
+);
+"""
+
+# bm25 column weights for subject, sender and body
+RANK_WEIGHTS = (5.0, 3.0, 1.0)
+
+def _db():
+    """Open MESSAGE_DB once per process and make sure the schema exists."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(MESSAGE_DB, check_same_thread=False)
+        columns = [row[1] for row in _conn.execute("PRAGMA table_info(messages)")]
+        if columns and "body" not in columns:
+            _conn.execute("ALTER TABLE messages ADD COLUMN body TEXT")
+        _conn.executescript(SCHEMA)
+        _backfill_index(_conn)
+    return _conn
+
+def _index_row(db, rowid, message, body):
+    """(Re)write the full-text entry of one cached message."""
+    sender = message.get("from") or {}
+    db.execute(
+        "INSERT OR REPLACE INTO message_index (rowid, subject, sender, body) VALUES (?, ?, ?, ?)",
+        (rowid, message.get("subject") or "",
+         f"{sender.get('name') or ''} {sender.get('address') or ''}",
+         body or message.get("intro") or "")
+    )
+
+def _backfill_index(db):
+    """Index messages cached before the full-text index existed."""
+    # Runs on every open; LIMIT 1 stops at the first row where COUNT(*)
+    # would scan the whole index
+    indexed = db.execute("SELECT 1 FROM message_index LIMIT 1").fetchone()
+    if indexed:
+        return
+    for rowid, data, body in db.execute("SELECT rowid, data, body FROM messages").fetchall():
+        _index_row(db, rowid, json.loads(data), body)
+    db.commit()
+
+def cached_messages(account):
+    """Return the cached message summaries of `account`, newest first."""
+    with _lock:
+        rows = _db().execute(
+            "SELECT data, seen FROM messages WHERE account = ? ORDER BY created_at DESC",
+            (account.lower(),)
+        ).fetchall()
+    messages = []
+    for data, seen in rows:
+        message = json.loads(data)
+        message["seen"] = bool(seen)
+        messages.append(message)
+    return messages
+
+def recent_messages(accounts, limit=20):
+    """
+    Return the newest `limit` cached messages across `accounts` as
+    (account, message) pairs, newest first.
+    """
+    accounts = [a.lower() for a in accounts]
+    if not accounts:
+        return []
+    placeholders = ",".join("?" * len(accounts))
+    with _lock:
+        rows = _db().execute(
+            f"SELECT account, data, seen FROM messages WHERE account IN ({placeholders}) "
+            "ORDER BY created_at DESC LIMIT ?",
+            (*accounts, limit)
+        ).fetchall()
+    result = []
+    for account, data, seen in rows:
+        message = json.loads(data)
+        message["seen"] = bool(seen)
+        result.append((account, message))
+    return result
+
+def newest_created_at(account):
+    """Return the `createdAt` of the newest cached message, or None."""
+    with _lock:
+        row = _db().execute(
+            "SELECT MAX(created_at) FROM messages WHERE account = ?",
+            (account.lower(),)
+        ).fetchone()
+    return row[0]
+
+def is_known(account, message_id):
+    """True if `message_id` is already cached for `account`."""
+    with _lock:
+        row = _db().execute(
+            "SELECT 1 FROM messages WHERE account = ? AND id = ?",
+            (account.lower(), message_id)
+        ).fetchone()
+    return row is not None
+
+def sync_state(account):
+    """
+    Return (complete, cursor) for `account`: whether its inbox has been
+    cached down to the last page, and otherwise the URL of the page an
+    unfinished sync resumes from (None to start from the first page).
+    """
+    with _lock:
+        row = _db().execute(
+            "SELECT complete, cursor FROM sync_state WHERE account = ?",
+            (account.lower(),)
+        ).fetchone()
+    return (bool(row[0]), row[1]) if row else (False, None)
+
+def set_sync_state(account, complete, cursor=None):
+    """Record how far the cache of `account` reaches, see sync_state()."""
+    with _lock:
+        db = _db()
+        db.execute(
+            "INSERT INTO sync_state (account, complete, cursor) VALUES (?, ?, ?) "
+            "ON CONFLICT (account) DO UPDATE SET complete = excluded.complete, cursor = excluded.cursor",
+            (account.lower(), int(bool(complete)), None if complete else cursor)
+        )
+        db.commit()
+
+def store_messages(account, messages):
+    """
+    Insert or update message summaries for `account`.
+    Returns the set of ids that were new or changed.
+    """
+    account = account.lower()
+    changed = set()
+    with _lock:
+        db = _db()
+        for message in messages:
+            data = json.dumps(message)
+            row = db.execute(
+                "SELECT data FROM messages WHERE account = ? AND id = ?",
+                (account, message["id"])
+            ).fetchone()
+            if row and row[0] == data:
+                continue
+            db.execute(
+                "INSERT INTO messages (account, id, created_at, seen, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, id) DO UPDATE SET "
+                "created_at = excluded.created_at, seen = excluded.seen, data = excluded.data",
+                (account, message["id"], message.get("createdAt", ""),
+                 int(bool(message.get("seen"))), data)
+            )
+            rowid, body = db.execute(
+                "SELECT rowid, body FROM messages WHERE account = ? AND id = ?",
+                (account, message["id"])
+            ).fetchone()
+            _index_row(db, rowid, message, body)
+            changed.add(message["id"])
+        db.commit()
+    return changed
+
+def mark_seen(account, message_id):
+    """Flag a cached message as read."""
+    with _lock:
+        db = _db()
+        db.execute(
+            "UPDATE messages SET seen = 1 WHERE account = ? AND id = ?",
+            (account.lower(), message_id)
+        )
+        db.commit()
+
+def mark_seen_many(account, message_ids):
+    """Flag several cached messages as read in one transaction."""
+    with _lock:
+        db = _db()
+        db.executemany(
+            "UPDATE messages SET seen = 1 WHERE account = ? AND id = ?",
+            ((account.lower(), message_id) for message_id in message_ids)
+        )
+        db.commit()
+
+def forget_messages(account, message_ids):
+    """Drop messages (and their search entries) from the cache of `account`."""
+    account = account.lower()
+    with _lock:
+        db = _db()
+        for message_id in message_ids:
+            row = db.execute("SELECT rowid FROM messages WHERE account = ? AND id = ?",
+                             (account, message_id)).fetchone()
+            if row:
+                db.execute("DELETE FROM message_index WHERE rowid = ?", (row[0],))
+                db.execute("DELETE FROM messages WHERE rowid = ?", (row[0],))
+        db.commit()
+
+def index_body(message_id, text):
+    """Store the full text body of a cached message and add it to the search index."""
+    with _lock:
+        db = _db()
+        rows = db.execute("SELECT rowid, data FROM messages WHERE id = ?", (message_id,)).fetchall()
+        for rowid, data in rows:
+            db.execute("UPDATE messages SET body = ? WHERE rowid = ?", (text, rowid))
+            _index_row(db, rowid, json.loads(data), text)
+        db.commit()
+
+def _match_expression(query):
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match,
+    and a trailing `*` makes it a prefix query.
+    """
+    terms = []
+    for word, star in re.findall(r"(\w+)(\*?)", query):
+        terms.append(f'"{word}"{star}')
+    return " ".join(terms)
+
+def search_messages(query, limit=20):
+    """
+    Ranked full-text search over every cached message of every account.
+    Returns (account, message, snippet) tuples, best match first.
+    """
+    expression = _match_expression(query)
+    if not expression:
+        return []
+    with _lock:
+        rows = _db().execute(
+            "SELECT m.account, m.data, m.seen, "
+            "snippet(message_index, 2, '[', ']', '...', 10) "
+            "FROM message_index JOIN messages m ON m.rowid = message_index.rowid "
+            "WHERE message_index MATCH ? "
+            "ORDER BY bm25(message_index, ?, ?, ?) LIMIT ?",
+            (expression, *RANK_WEIGHTS, limit)
+        ).fetchall()
+    results = []
+    for account, data, seen, snippet in rows:
+        message = json.loads(data)
+        message["seen"] = bool(seen)
+        results.append((account, message, snippet))
+    return results
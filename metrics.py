@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Recent latencies kept per endpoint for on-screen percentiles
+RECENT_SAMPLES = 512
+
+_lock = threading.Lock()
+_endpoints = {}  # (method, endpoint) -> counters, see _entry()
+
+def endpoint_of(url):
+    """
+    Collapse a URL to its endpoint template, e.g.
+    https://api.mail.tm/messages/64f0c1... -> /messages/{id}
+    """
+    segments = [s for s in urlparse(url).path.split("/") if s]
+    for i in range(1, len(segments)):
+        if not segments[i].isalpha():
+            segments[i] = "{id}"
+    return "/" + "/".join(segments)
+
+def _entry(method, endpoint):
+    key = (method.upper(), endpoint)
+    entry = _endpoints.get(key)
+    if entry is None:
+        entry = _endpoints[key] = {
+            "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+            "count": 0,
+            "seconds": 0.0,
+            "statuses": {},
+            "errors": 0,
+            "retries": 0,
+            "throttled": 0.0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "recent": deque(maxlen=RECENT_SAMPLES),
+        }
+    return entry
+
+def record(method, url, status, seconds, bytes_in=0, bytes_out=0):
+    """
+    Count one finished call. `status` is the HTTP status code, or the
+    exception class name when no response came back.
+    """
+    bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+    with _lock:
+        entry = _entry(method, endpoint_of(url))
+        entry["buckets"][bucket] += 1
+        entry["count"] += 1
+        entry["seconds"] += seconds
+        entry["statuses"][str(status)] = entry["statuses"].get(str(status), 0) + 1
+        if not isinstance(status, int) or status >= 400:
+            entry["errors"] += 1
+        entry["bytes_in"] += bytes_in
+        entry["bytes_out"] += bytes_out
+        entry["recent"].append(seconds)
+
+def record_retry(method, url):
+    """Count a retry of a call that is about to be sent again."""
+    with _lock:
+        _entry(method, endpoint_of(url))["retries"] += 1
+
+def record_throttle(method, url, seconds):
+    """Count time a call spent held back by the client-side rate limiter."""
+    with _lock:
+        _entry(method, endpoint_of(url))["throttled"] += seconds
+
+def _body_size(body):
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+def timed(method, url, send, **kwargs):
+    """
+    Call send(method, url, **kwargs), typically a Session.request, and
+    record latency, status and bytes for it. Exceptions are recorded by
+    class name and re-raised.
+    """
+    started = time.perf_counter()
+    try:
+        response = send(method, url, **kwargs)
+    except requests.exceptions.RequestException as e:
+        record(method, url, type(e).__name__, time.perf_counter() - started)
+        raise
+    # Streamed bodies are not read here; count what the server declared
+    if kwargs.get("stream"):
+        bytes_in = int(response.headers.get("Content-Length") or 0)
+    else:
+        bytes_in = len(response.content)
+    record(method, url, response.status_code, time.perf_counter() - started,
+           bytes_in, _body_size(response.request.body))
+    return response
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def snapshot():
+    """Return one dict per (method, endpoint), busiest first."""
+    with _lock:
+        rows = []
+        for (method, endpoint), e in _endpoints.items():
+            recent = list(e["recent"])
+            rows.append({
+                "method": method,
+                "endpoint": endpoint,
+                "count": e["count"],
+                "errors": e["errors"],
+                "retries": e["retries"],
+                "throttled_seconds": e["throttled"],
+                "statuses": dict(e["statuses"]),
+                "bytes_in": e["bytes_in"],
+                "bytes_out": e["bytes_out"],
+                "seconds_sum": e["seconds"],
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], e["buckets"])),
+                "p50": _percentile(recent, 0.5),
+                "p95": _percentile(recent, 0.95),
+            })
+    return sorted(rows, key=lambda r: -r["count"])
+
+def reset():
+    """Forget everything recorded so far."""
+    with _lock:
+        _endpoints.clear()
+
+def to_json():
+    return json.dumps({"generated_at": time.time(), "endpoints": snapshot()}, indent=2)
+
+def to_prometheus():
+    """Render the counters in the Prometheus text exposition format."""
+    rows = snapshot()
+    out = [
+        "# HELP cybermail_api_request_duration_seconds mail.tm API call latency.",
+        "# TYPE cybermail_api_request_duration_seconds histogram",
+    ]
+    for r in rows:
+        labels = f'method="{r["method"]}",endpoint="{r["endpoint"]}"'
+        cumulative = 0
+        for bound, n in r["buckets"].items():
+            cumulative += n
+            out.append(f'cybermail_api_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        out.append(f"cybermail_api_request_duration_seconds_sum{{{labels}}} {r['seconds_sum']:.6f}")
+        out.append(f"cybermail_api_request_duration_seconds_count{{{labels}}} {r['count']}")
+    for name, field, help_text in (
+        ("cybermail_api_errors_total", "errors", "Calls that failed or returned 4xx/5xx."),
+        ("cybermail_api_retries_total", "retries", "Calls sent again after a failure."),
+        ("cybermail_api_throttled_seconds_total", "throttled_seconds", "Time spent waiting on the rate limiter or backoff."),
+        ("cybermail_api_received_bytes_total", "bytes_in", "Response body bytes."),
+        ("cybermail_api_sent_bytes_total", "bytes_out", "Request body bytes."),
+    ):
+        out.append(f"# HELP {name} {help_text}")
+        out.append(f"# TYPE {name} counter")
+        for r in rows:
+            out.append(f'{name}{{method="{r["method"]}",endpoint="{r["endpoint"]}"}} {r[field]}')
+    out.append("# HELP cybermail_api_responses_total Calls by HTTP status or exception.")
+    out.append("# TYPE cybermail_api_responses_total counter")
+    for r in rows:
+        for status, n in sorted(r["statuses"].items()):
+            out.append(f'cybermail_api_responses_total{{method="{r["method"]}",endpoint="{r["endpoint"]}",'
+                       f'status="{status}"}} {n}')
+    return "\n".join(out) + "\n"
+
+def export(path):
+    """Write the metrics to `path`: JSON for *.json, Prometheus text otherwise."""
+    text = to_json() if path.endswith(".json") else to_prometheus()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
@@ -0,0 +1,159 @@
+import re
+import shutil
+import sys
+import textwrap
+
+from colors import Colors
+from effects import getch, write_frame
+
+# Longer lines are cut into pieces of this size up front, so one huge
+# line (minified HTML, a log dump) is never wrapped in a single call
+LONG_LINE = 4096
+HELP = "[space/b] page  [j/k] line  [g/G] top/bottom  [/] search  [n/N] next/prev  [q] quit"
+
+def _wrapped(lines, cache, index, width):
+    """Wrapped rows of one logical line, computed on first use only."""
+    rows = cache.get(index)
+    if rows is None:
+        rows = cache[index] = textwrap.wrap(lines[index].expandtabs(), width, break_on_hyphens=False,
+                                            drop_whitespace=False) or [""]
+    return rows
+
+def _down(lines, cache, pos, count, width):
+    """Move a (line, row) position `count` rows forward, stopping at the last row."""
+    line, row = pos
+    for _ in range(count):
+        if row + 1 < len(_wrapped(lines, cache, line, width)):
+            row += 1
+        elif line + 1 < len(lines):
+            line, row = line + 1, 0
+        else:
+            break
+    return line, row
+
+def _up(lines, cache, pos, count, width):
+    line, row = pos
+    for _ in range(count):
+        if row > 0:
+            row -= 1
+        elif line > 0:
+            line -= 1
+            row = len(_wrapped(lines, cache, line, width)) - 1
+        else:
+            break
+    return line, row
+
+def _window(lines, cache, pos, height, width):
+    """The rows visible from `pos`, wrapping only the lines they come from."""
+    line, row = pos
+    rows = []
+    while len(rows) < height and line < len(lines):
+        rows.extend(_wrapped(lines, cache, line, width)[row:])
+        line, row = line + 1, 0
+    return rows[:height]
+
+def _bottom(lines, cache, height, width):
+    last = len(lines) - 1
+    return _up(lines, cache, (last, len(_wrapped(lines, cache, last, width)) - 1), height - 1, width)
+
+def _find(lines, term, start, step):
+    """Index of the next line containing `term` (lowercase), searching from `start` by `step`."""
+    index = start
+    while 0 <= index < len(lines):
+        if term in lines[index].lower():
+            return index
+        index += step
+    return None
+
+def _highlight(row, term):
+    if not term:
+        return row
+    return re.sub(re.escape(term), lambda m: f"{Colors.BG_YELLOW}{Colors.BLACK}{m.group(0)}{Colors.RESET}{Colors.BRIGHT_WHITE}",
+                  row, flags=re.IGNORECASE)
+
+def page_text(text, title=""):
+    """
+    Show `text` one screen at a time. Lines are wrapped lazily, only as
+    they scroll into view, so multi-megabyte bodies open instantly.
+    Supports paging, top/bottom jumps and case-insensitive search.
+    """
+    lines = []
+    for line in text.split("\n"):
+        if len(line) > LONG_LINE:
+            lines.extend(line[i:i + LONG_LINE] for i in range(0, len(line), LONG_LINE))
+        else:
+            lines.append(line)
+    cache = {}
+    cache_width = None
+    pos = (0, 0)
+    term = ""
+    message = ""
+    while True:
+        size = shutil.get_terminal_size()
+        width = max(20, size.columns - 1)
+        # Rows left for the body under the optional title and above the status line
+        body_height = max(3, size.lines - 2 - (1 if title else 0))
+        if width != cache_width:
+            # Wrapped rows depend on the width; rewrap lazily after a resize
+            cache.clear()
+            cache_width = width
+
+        rows = _window(lines, cache, pos, body_height, width)
+        percent = 100 * (pos[0] + 1) // len(lines)
+        status = message or f"line {pos[0] + 1}/{len(lines)} ({percent}%)  {HELP}"
+        frame = ["\x1b[H\x1b[2J"]
+        if title:
+            frame.append(f"{Colors.NEON_PURPLE}{title[:width]}{Colors.RESET}\n")
+        frame.extend(f"{Colors.BRIGHT_WHITE}{_highlight(row, term)}{Colors.RESET}\n" for row in rows)
+        frame.append(f"{Colors.BRIGHT_BLACK}{status[:width]}{Colors.RESET}")
+        write_frame("".join(frame))
+        message = ""
+
+        key = getch()
+        if key in ('q', 'Q'):
+            break
+        if key == '\x03':
+            raise KeyboardInterrupt
+        if key in (' ', 'f'):
+            pos = _down(lines, cache, pos, body_height, width)
+        elif key == 'b':
+            pos = _up(lines, cache, pos, body_height, width)
+        elif key in ('j', '\r', '\n'):
+            pos = _down(lines, cache, pos, 1, width)
+        elif key == 'k':
+            pos = _up(lines, cache, pos, 1, width)
+        elif key == 'g':
+            pos = (0, 0)
+        elif key == 'G':
+            pos = _bottom(lines, cache, body_height, width)
+        elif key == '/':
+            write_frame(f"\r\x1b[K{Colors.BRIGHT_CYAN}/{Colors.RESET}")
+            term = input().strip().lower()
+            found = _find(lines, term, pos[0] + 1, 1) if term else None
+            if found is None:
+                message = f"pattern not found: {term}" if term else ""
+            else:
+                pos = (found, 0)
+        elif key in ('n', 'N') and term:
+            found = _find(lines, term, pos[0] + (1 if key == 'n' else -1), 1 if key == 'n' else -1)
+            if found is None:
+                message = f"no more matches for: {term}"
+            else:
+                pos = (found, 0)
+        # Never scroll past the last full screen
+        bottom = _bottom(lines, cache, body_height, width)
+        if pos > bottom:
+            pos = bottom
+    write_frame("\x1b[H\x1b[2J")
+
+def show_text(text, title=""):
+    """
+    Print `text`, or open it in the pager when it is longer than the
+    terminal and stdout is interactive.
+    """
+    size = shutil.get_terminal_size()
+    short = text.count("\n") < size.lines - 4 and len(text) < size.columns * (size.lines - 4)
+    if short or not sys.stdout.isatty() or not sys.stdin.isatty():
+        print(f"{Colors.BRIGHT_WHITE}{text}{Colors.RESET}")
+        return
+    page_text(text, title)
@@ -10,6 +10,13 @@ def display_cyberpunk_progress_bar(current, total, bar_length=50):
             display_cyberpunk_progress_bar(i, total)
             # ... do work ...
     """
+    print(f"\r{format_cyberpunk_progress_bar(current, total, bar_length)}", end="", flush=True)
+
+def format_cyberpunk_progress_bar(current, total, bar_length=50):
+    """
+    Return the cyberpunk‑themed progress bar as a string, e.g. for a
+    terminal.set_line() live line.
+    """
     if total <= 0:
         raise ValueError("Total must be > 0")
     
@@ -38,7 +45,7 @@ def display_cyberpunk_progress_bar(current, total, bar_length=50):
     status_display = f"{Colors.BRIGHT_BLACK}[{color}{status}{Colors.BRIGHT_BLACK}]{Colors.RESET}"
     count_display  = f"{Colors.NEON_CYAN}{current}{Colors.RESET}/{Colors.NEON_CYAN}{total}{Colors.RESET}"
     
-    print(f"\r{bar_display} {percent_text} {status_display} ({count_display})", end="", flush=True)
+    return f"{bar_display} {percent_text} {status_display} ({count_display})"
 
 
 def display_simple_progress_bar(current, total, bar_length=40):
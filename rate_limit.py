@@ -0,0 +1,62 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# mail.tm allows 8 requests per second per IP. A bucket of RATE/s with
+# BURST tokens can put RATE + BURST calls in one wall-clock second, so
+# keep the sum at 8. MAILTM_RATE_LIMIT overrides RATE; 0 turns pacing off
+# (429 and 5xx handling stay on), e.g. against the local stand-in
+RATE = float(os.environ.get("MAILTM_RATE_LIMIT", "7"))
+BURST = 1
+# Retries after 429 or 5xx, and the jittered exponential backoff for 5xx
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+
+_lock = threading.Lock()
+# Token bucket kept as a theoretical arrival time (GCRA): a request may
+# start once `now >= _tat - (BURST - 1) / RATE`
+_state = {"tat": 0.0, "paused_until": 0.0}
+
+def acquire():
+    """
+    Block until the shared bucket has a token for one request. Returns
+    the seconds spent waiting (0.0 when a token was free).
+    """
+    interval = 1.0 / RATE if RATE > 0 else 0.0
+    with _lock:
+        now = time.monotonic()
+        start = max(now, _state["tat"] - (BURST - 1) * interval, _state["paused_until"])
+        _state["tat"] = max(_state["tat"], start) + interval
+    wait = start - now
+    if wait > 0:
+        time.sleep(wait)
+    return max(wait, 0.0)
+
+def pause(seconds):
+    """Hold every caller for `seconds`, e.g. after a 429 with Retry-After."""
+    with _lock:
+        until = time.monotonic() + seconds
+        _state["paused_until"] = max(_state["paused_until"], until)
+        _state["tat"] = max(_state["tat"], until)
+
+def retry_after(response):
+    """Seconds asked for by a Retry-After header (delta or HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff(attempt):
+    """Jittered exponential delay before retry number `attempt` (0-based)."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
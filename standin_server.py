@@ -0,0 +1,508 @@
+"""
+Local stand-in for the mail.tm API and its Mercure hub, for offline runs,
+tests and load benchmarks.
+
+Usage:
+    python standin_server.py --port 8025 --messages 200 --latency 0.05
+
+    MAILTM_BASE_URL=http://127.0.0.1:8025 \\
+    MAILTM_MERCURE_URL=http://127.0.0.1:8025/.well-known/mercure \\
+    MAILTM_USE_PROXIES=0 python main.py
+
+Implements POST /token, POST /accounts, DELETE /accounts/{id}, GET /domains, GET /me,
+GET /messages, GET|PATCH|DELETE /messages/{id}, raw sources
+(GET /messages/{id}/download), attachment downloads
+(GET /messages/{id}/attachment/{attachmentId}, with Range support) and
+the Mercure subscription endpoint. Latency, page size, seeded message
+volume, attachments and 429/5xx injection are configurable; see DEFAULTS.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from email import policy
+from email.message import EmailMessage
+from email.utils import format_datetime, formataddr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULTS = {
+    "latency": 0.0,          # seconds added to every API response
+    "connect_delay": 0.0,    # seconds slept once per new TCP connection (handshake cost)
+    "jitter": 0.0,           # extra uniform random latency, seconds
+    "page_size": 30,         # /messages page size (mail.tm uses 30)
+    "messages": 20,          # messages seeded into each new account
+    "error_rate": 0.0,       # fraction of API calls answered with a 5xx
+    "rate_limit_rate": 0.0,  # fraction of API calls answered with 429
+    "qps": 0,                # hard requests-per-second cap (0 = none), 429 beyond it
+    "retry_after": 1,        # Retry-After seconds sent with 429
+    "auto_accounts": True,   # /token creates unknown accounts instead of 401
+    "mail_interval": 0.0,    # deliver one new message to every account this often
+    "attachment_every": 5,   # every Nth message carries 1-3 attachments (0 = none)
+    "attachment_size": 256 * 1024,  # bytes of the first attachment; later ones double
+    "bandwidth": 0,          # attachment download cap, bytes per second (0 = none)
+    "domain": "standin.test",
+    "token_ttl": 3600,
+}
+
+SUBJECTS = ("Verify your email", "Your login code", "Welcome aboard", "Invoice available",
+            "Password reset request", "Weekly digest", "Security alert", "Order shipped")
+SENDERS = (("Acme Support", "support@acme.example"), ("NoReply", "noreply@service.example"),
+           ("Billing", "billing@shop.example"), ("Security", "security@bank.example"))
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def attachment_body(attachment_id, size):
+    """Deterministic content of a stand-in attachment, built on demand."""
+    block = hashlib.sha256(attachment_id.encode()).digest() * 2048
+    return (block * (size // len(block) + 1))[:size]
+
+def rfc822_source(message):
+    """Build the raw RFC 822 source of a stand-in message (CRLF line endings)."""
+    mail = EmailMessage(policy=policy.SMTP)
+    sender = message["from"]
+    mail["From"] = formataddr((sender["name"], sender["address"]))
+    mail["To"] = ", ".join(r["address"] for r in message["to"])
+    mail["Subject"] = message["subject"]
+    mail["Date"] = format_datetime(datetime.fromisoformat(message["createdAt"]))
+    mail["Message-ID"] = message["msgid"]
+    mail.set_content(message["text"])
+    mail.add_alternative("\n".join(message["html"]), subtype="html")
+    for att in message["attachments"]:
+        mail.add_attachment(attachment_body(f"{message['id']}/{att['id']}", att["size"]),
+                            maintype="application", subtype="octet-stream", filename=att["filename"])
+    return mail.as_bytes()
+
+def _b64(obj):
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+class MailStore:
+    """Accounts, messages and Mercure subscribers, shared by all handler threads."""
+
+    def __init__(self, options):
+        self.options = options
+        self.lock = threading.Lock()
+        self.accounts = {}     # lowercased address -> account dict (with password)
+        self.by_id = {}        # account id -> account dict
+        self.messages = {}     # account id -> list of messages, newest first
+        self.events = {}       # account id -> list of (event id, payload)
+        self.subscribers = {}  # account id -> list of queue.Queue
+        self.counter = 0
+
+    def create_account(self, address, password):
+        """Add an account with the seeded message volume; None if it exists."""
+        with self.lock:
+            if address.lower() in self.accounts:
+                return None
+            account = {"id": uuid.uuid4().hex[:24], "address": address, "password": password,
+                       "quota": 40000000, "used": 0, "isDisabled": False, "isDeleted": False,
+                       "createdAt": _now(), "updatedAt": _now()}
+            self.accounts[address.lower()] = account
+            self.by_id[account["id"]] = account
+            self.messages[account["id"]] = []
+            self.events[account["id"]] = []
+        self.deliver(account["id"], self.options["messages"], publish=False)
+        return account
+
+    def token_for(self, account):
+        claims = {"iat": int(time.time()), "exp": int(time.time()) + self.options["token_ttl"],
+                  "username": account["address"], "id": account["id"]}
+        return f"{_b64({'typ': 'JWT', 'alg': 'none'})}.{_b64(claims)}.standin"
+
+    def account_for_token(self, token):
+        """Return the account behind a bearer token, or None if invalid or expired."""
+        try:
+            payload = token.split(".")[1]
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (IndexError, ValueError):
+            return None
+        if claims.get("exp", 0) < time.time():
+            return None
+        return self.by_id.get(claims.get("id"))
+
+    def deliver(self, account_id, count=1, publish=True):
+        """Add `count` new messages to an account and push them to its subscribers."""
+        account = self.by_id[account_id]
+        for _ in range(count):
+            with self.lock:
+                self.counter += 1
+                n = self.counter
+                name, sender = SENDERS[n % len(SENDERS)]
+                subject = f"{SUBJECTS[n % len(SUBJECTS)]} #{n}"
+                text = (f"Hello,\n\nThis is stand-in message {n} for {account['address']}.\n\n"
+                        + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (1 + n % 12)
+                        + f"\n\nYour code is {100000 + n * 7919 % 900000}.\n")
+                message = {
+                    "@id": None, "@type": "Message",
+                    "id": uuid.uuid4().hex[:24], "accountId": f"/accounts/{account_id}",
+                    "msgid": f"<{n}@standin>",
+                    "from": {"name": name, "address": sender},
+                    "to": [{"name": "", "address": account["address"]}],
+                    "subject": subject, "intro": text[:120].replace("\n", " "),
+                    "seen": False, "isDeleted": False, "hasAttachments": False,
+                    "size": len(text), "createdAt": _now(), "updatedAt": _now(),
+                    "text": text, "html": [f"<p>{line}</p>" for line in text.split("\n") if line],
+                    "cc": [], "bcc": [], "flagged": False, "verifications": [],
+                    "retention": True, "retentionDate": _now(), "attachments": [],
+                }
+                message["@id"] = f"/messages/{message['id']}"
+                message["downloadUrl"] = f"/messages/{message['id']}/download"
+                every = self.options["attachment_every"]
+                if every and n % every == 0:
+                    message["hasAttachments"] = True
+                    message["attachments"] = [{
+                        "id": f"ATTACH{i:06d}", "filename": f"document-{n}-{i}.bin",
+                        "contentType": "application/octet-stream", "disposition": "attachment",
+                        "transferEncoding": "base64", "related": False,
+                        "size": self.options["attachment_size"] << (i - 1),
+                        "downloadUrl": f"/messages/{message['id']}/attachment/ATTACH{i:06d}",
+                    } for i in range(1, 2 + n % 3)]
+                self.messages[account_id].insert(0, message)
+            if publish:
+                self.publish(account_id, summary(message))
+
+    def publish(self, account_id, payload):
+        with self.lock:
+            log = self.events[account_id]
+            event_id = f"urn:uuid:{uuid.uuid4()}"
+            log.append((event_id, payload))
+            for q in self.subscribers.get(account_id, []):
+                q.put((event_id, payload))
+
+    def find_message(self, account_id, message_id):
+        for message in self.messages.get(account_id, []):
+            if message["id"] == message_id:
+                return message
+        return None
+
+LIST_FIELDS = ("@id", "@type", "id", "accountId", "msgid", "from", "to", "subject", "intro",
+               "seen", "isDeleted", "hasAttachments", "size", "downloadUrl", "createdAt", "updatedAt")
+
+def summary(message):
+    """The subset of a message returned by the /messages collection."""
+    return {field: message[field] for field in LIST_FIELDS}
+
+def public_account(account):
+    return {k: v for k, v in account.items() if k != "password"}
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """mail.tm routes over keep-alive HTTP/1.1; `store` and `options` are set by start_server()."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    store = None
+    options = DEFAULTS
+    _window = [0, 0]  # [second, requests in it] for the --qps cap
+    _window_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        if self.options["connect_delay"]:
+            time.sleep(self.options["connect_delay"])
+
+    def _send(self, status, body=None, headers=None, content_type="application/ld+json"):
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        if body is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def _faults(self):
+        """Apply latency and injected failures. Returns True if a fault response was sent."""
+        opts = self.options
+        delay = opts["latency"] + random.uniform(0, opts["jitter"])
+        if delay > 0:
+            time.sleep(delay)
+        limited = random.random() < opts["rate_limit_rate"]
+        if opts["qps"]:
+            with self._window_lock:
+                second = int(time.time())
+                if self._window[0] != second:
+                    self._window[:] = [second, 0]
+                self._window[1] += 1
+                limited = limited or self._window[1] > opts["qps"]
+        if limited:
+            self._send(429, {"code": 429, "message": "Too Many Requests"},
+                       {"Retry-After": str(opts["retry_after"])})
+            return True
+        if random.random() < opts["error_rate"]:
+            status = random.choice((500, 502, 503))
+            self._send(status, {"code": status, "message": "Injected failure"})
+            return True
+        return False
+
+    def _account(self):
+        auth = self.headers.get("Authorization", "")
+        account = self.store.account_for_token(auth[len("Bearer "):]) if auth.startswith("Bearer ") else None
+        if account is None:
+            self._send(401, {"code": 401, "message": "Invalid JWT Token"})
+        return account
+
+    def _route(self, method):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        if parts[:2] == [".well-known", "mercure"]:
+            return self._mercure(url)
+        body = self._read_json() if method in ("POST", "PATCH") else {}
+        if self._faults():
+            return
+
+        if not parts:
+            return self._send(200, {"@type": "StandIn", "service": "mail.tm stand-in"})
+        if parts == ["token"] and method == "POST":
+            return self._token(body)
+        if parts == ["domains"] and method == "GET":
+            domain = {"@id": "/domains/standin", "@type": "Domain", "id": "standin",
+                      "domain": self.options["domain"], "isActive": True, "isPrivate": False}
+            return self._send(200, {"hydra:member": [domain], "hydra:totalItems": 1})
+        if parts == ["accounts"] and method == "POST":
+            address, password = body.get("address", ""), body.get("password", "")
+            account = self.store.create_account(address, password) if address and password else None
+            if account is None:
+                return self._send(422, {"code": 422, "message": "address: This value is already used."})
+            return self._send(201, public_account(account))
+
+        account = self._account()
+        if account is None:
+            return
+        if parts == ["me"] and method == "GET":
+            if account["isDeleted"]:
+                return self._send(404, {"code": 404, "message": "Not Found"})
+            return self._send(200, public_account(account))
+        if len(parts) == 2 and parts[0] == "accounts" and method == "DELETE":
+            if parts[1] != account["id"]:
+                return self._send(403, {"code": 403, "message": "Access Denied."})
+            # Kept (flagged) so auto_accounts does not bring it back on /token
+            account["isDeleted"] = True
+            return self._send(204)
+        if parts == ["messages"] and method == "GET":
+            return self._messages(account, url)
+        if len(parts) == 2 and parts[0] == "messages":
+            return self._message(account, parts[1], method, body)
+        if len(parts) == 3 and parts[0] == "messages" and parts[2] == "download" and method == "GET":
+            return self._source(account, parts[1])
+        if len(parts) == 4 and parts[0] == "messages" and parts[2] == "attachment" and method == "GET":
+            return self._attachment(account, parts[1], parts[3])
+        self._send(404, {"code": 404, "message": "Not Found"})
+
+    def _token(self, body):
+        address, password = body.get("address", ""), body.get("password", "")
+        account = self.store.accounts.get(address.lower())
+        if account is None and self.options["auto_accounts"] and address and password:
+            account = self.store.create_account(address, password) or self.store.accounts.get(address.lower())
+        if account is None or account["password"] != password:
+            return self._send(401, {"code": 401, "message": "Invalid credentials."})
+        self._send(200, {"token": self.store.token_for(account), "id": account["id"]})
+
+    def _messages(self, account, url):
+        page = max(1, int((parse_qs(url.query).get("page") or ["1"])[0] or 1))
+        size = self.options["page_size"]
+        with self.store.lock:
+            messages = self.store.messages[account["id"]]
+            total = len(messages)
+            members = [summary(m) for m in messages[(page - 1) * size:page * size]]
+        last = max(1, (total + size - 1) // size)
+        view = {"@id": f"/messages?page={page}", "@type": "hydra:PartialCollectionView",
+                "hydra:first": "/messages?page=1", "hydra:last": f"/messages?page={last}"}
+        if page < last:
+            view["hydra:next"] = f"/messages?page={page + 1}"
+        if page > 1:
+            view["hydra:previous"] = f"/messages?page={page - 1}"
+        self._send(200, {"@context": "/contexts/Message", "@id": "/messages", "@type": "hydra:Collection",
+                         "hydra:member": members, "hydra:totalItems": total, "hydra:view": view})
+
+    def _message(self, account, message_id, method, patch):
+        message = self.store.find_message(account["id"], message_id)
+        if message is None:
+            return self._send(404, {"code": 404, "message": "Not Found"})
+        if method == "GET":
+            return self._send(200, message)
+        if method == "PATCH":
+            with self.store.lock:
+                if "seen" in patch:
+                    message["seen"] = bool(patch["seen"])
+                message["updatedAt"] = _now()
+            self.store.publish(account["id"], summary(message))
+            return self._send(200, {"seen": message["seen"]})
+        if method == "DELETE":
+            with self.store.lock:
+                self.store.messages[account["id"]].remove(message)
+            return self._send(204)
+        self._send(405, {"code": 405, "message": "Method Not Allowed"})
+
+    def _source(self, account, message_id):
+        message = self.store.find_message(account["id"], message_id)
+        if message is None:
+            return self._send(404, {"code": 404, "message": "Not Found"})
+        data = rfc822_source(message)
+        self.send_response(200)
+        self.send_header("Content-Type", "message/rfc822")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _attachment(self, account, message_id, attachment_id):
+        """Serve an attachment body, honouring `Range: bytes=start-[end]`."""
+        message = self.store.find_message(account["id"], message_id)
+        attachment = next((a for a in (message or {}).get("attachments", []) if a["id"] == attachment_id), None)
+        if attachment is None:
+            return self._send(404, {"code": 404, "message": "Not Found"})
+        size = attachment["size"]
+        start, end = 0, size - 1
+        requested = self.headers.get("Range", "")
+        if requested.startswith("bytes="):
+            first, _, last = requested[len("bytes="):].partition("-")
+            start = int(first or 0)
+            end = min(int(last), size - 1) if last else size - 1
+            if start >= size:
+                return self._send(416, {"code": 416, "message": "Range Not Satisfiable"},
+                                  {"Content-Range": f"bytes */{size}"})
+        data = attachment_body(f"{message_id}/{attachment_id}", size)[start:end + 1]
+        self.send_response(206 if requested else 200)
+        self.send_header("Content-Type", attachment["contentType"])
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Accept-Ranges", "bytes")
+        if requested:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        step = 64 * 1024
+        try:
+            for i in range(0, len(data), step):
+                self.wfile.write(data[i:i + step])
+                if self.options["bandwidth"]:
+                    time.sleep(step / self.options["bandwidth"])
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _mercure(self, url):
+        """Stream updates for /accounts/{id} as Server-Sent Events until the client leaves."""
+        topic = (parse_qs(url.query).get("topic") or [""])[0]
+        account = self._account()
+        if account is None:
+            return
+        if topic != f"/accounts/{account['id']}":
+            return self._send(403, {"code": 403, "message": "Forbidden topic"})
+        q = queue.Queue()
+        last_id = self.headers.get("Last-Event-ID")
+        with self.store.lock:
+            backlog = self.store.events[account["id"]]
+            ids = [event_id for event_id, _ in backlog]
+            missed = backlog[ids.index(last_id) + 1:] if last_id in ids else []
+            for event in missed:
+                q.put(event)
+            self.store.subscribers.setdefault(account["id"], []).append(q)
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        # Chunked, so clients reading "as data arrives" see each event at once
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_chunk(text):
+            data = text.encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        try:
+            write_chunk("retry: 1000\n\n")
+            while True:
+                try:
+                    event_id, payload = q.get(timeout=15)
+                    write_chunk(f"id: {event_id}\ndata: {json.dumps(payload)}\n\n")
+                except queue.Empty:
+                    write_chunk(": heartbeat\n\n")
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            with self.store.lock:
+                self.store.subscribers[account["id"]].remove(q)
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+def _mail_loop(store, interval, stopped):
+    while not stopped.wait(interval):
+        for account_id in list(store.by_id):
+            store.deliver(account_id)
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """
+    Start the stand-in on a daemon thread and return the server. Its
+    `base_url`, `mercure_url` and `store` attributes are set for callers;
+    call shutdown() to stop it.
+    """
+    unknown = set(options) - set(DEFAULTS)
+    if unknown:
+        raise TypeError(f"unknown stand-in options: {', '.join(sorted(unknown))}")
+    opts = dict(DEFAULTS, **options)
+    handler = type("ConfiguredStandInHandler", (StandInHandler,),
+                   {"options": opts, "store": MailStore(opts), "_window": [0, 0]})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.store = handler.store
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.mercure_url = f"{server.base_url}/.well-known/mercure"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    if opts["mail_interval"]:
+        stopped = threading.Event()
+        threading.Thread(target=_mail_loop, args=(server.store, opts["mail_interval"], stopped),
+                         daemon=True).start()
+        shutdown = server.shutdown
+        server.shutdown = lambda: (stopped.set(), shutdown())
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mail.tm stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    for name, default in DEFAULTS.items():
+        flag = "--" + name.replace("_", "-")
+        if isinstance(default, bool):
+            parser.add_argument(flag, type=lambda v: v.lower() not in ("0", "false", "no"), default=default)
+        else:
+            parser.add_argument(flag, type=type(default), default=default)
+    args = vars(parser.parse_args())
+    host, port = args.pop("host"), args.pop("port")
+    server = start_server(host, port, **args)
+    print(f"mail.tm stand-in on {server.base_url}")
+    print(f"  MAILTM_BASE_URL={server.base_url}")
+    print(f"  MAILTM_MERCURE_URL={server.mercure_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Terminal scheduler: one render thread owns stdout while work runs.
+
+Commands post state instead of printing in between blocking calls:
+    terminal.spinner("conn", "Connecting...")   # animated live line
+    terminal.set_line("bar", text)              # replace a live line
+    terminal.post("done")                       # permanent line above the live area
+    terminal.remove_line("conn", final="OK")    # drop a live line, optionally leaving text
+    terminal.flush()                            # wait until all of it is on screen
+
+Live lines are redrawn REFRESH_RATE times a second by the render thread,
+so spinners keep moving while the caller blocks on the network. Print
+directly only when no live line is shown, after flush().
+"""
+import threading
+import time
+
+from colors import Colors
+from effects import write_frame
+
+SPINNER = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
+# Live-area redraws per second while anything is shown
+REFRESH_RATE = 12
+
+_cond = threading.Condition()
+_pending = []   # permanent lines waiting to be written above the live area
+_live = {}      # key -> str, or callable(tick) -> str for animated lines
+_state = {"drawn": 0, "dirty": False, "thread": None}
+
+def _ensure_thread():
+    if _state["thread"] is None:
+        _state["thread"] = threading.Thread(target=_render_loop, name="terminal", daemon=True)
+        _state["thread"].start()
+
+def _render_loop():
+    """Compose and write one frame per tick: erase live area, new lines, live area."""
+    interval = 1.0 / REFRESH_RATE
+    while True:
+        with _cond:
+            while not (_pending or _live or _state["dirty"]):
+                _cond.wait()
+            pending = _pending[:]
+            del _pending[:]
+            tick = int(time.monotonic() * REFRESH_RATE)
+            live = [line(tick) if callable(line) else line for line in _live.values()]
+            drawn = _state["drawn"]
+            _state["drawn"] = len(live)
+            _state["dirty"] = False
+
+        parts = []
+        if drawn:
+            parts.append("\r\x1b[K" + "\x1b[1A\x1b[K" * (drawn - 1))
+        parts.extend(line + "\n" for line in pending)
+        parts.append("\n".join(live))
+        write_frame("".join(parts))
+
+        with _cond:
+            _cond.notify_all()
+            if _live and not _pending:
+                _cond.wait(interval)
+
+def post(text=""):
+    """Print `text` as permanent output above any live lines."""
+    with _cond:
+        _pending.extend(str(text).split("\n"))
+        _ensure_thread()
+        _cond.notify_all()
+
+def set_line(key, content):
+    """Show or replace the live line `key`; `content` is text or callable(tick) -> text."""
+    with _cond:
+        _live[key] = content
+        _state["dirty"] = True
+        _ensure_thread()
+        _cond.notify_all()
+
+def spinner(key, message, color=Colors.BRIGHT_CYAN, prefix=""):
+    """Show an animated spinner line `key` until remove_line(key)."""
+    set_line(key, lambda tick: f"{prefix}{color}{SPINNER[tick % len(SPINNER)]}{Colors.RESET} {message}")
+
+def remove_line(key, final=None):
+    """Drop the live line `key`; `final`, if given, is left in its place as permanent output."""
+    with _cond:
+        _live.pop(key, None)
+        if final is not None:
+            _pending.extend(str(final).split("\n"))
+        _state["dirty"] = True
+        _ensure_thread()
+        _cond.notify_all()
+
+def flush():
+    """Block until everything posted so far has been written."""
+    with _cond:
+        while _state["thread"] is not None and (_pending or _state["dirty"]):
+            _cond.wait()
@@ -0,0 +1,108 @@
+import base64
+import json
+import os
+import threading
+import time
+
+TOKEN_FILE = "tokens.json"
+# Treat tokens as expired this many seconds before their real `exp`
+REFRESH_MARGIN = 120
+
+_tokens = None
+_lock = threading.RLock()
+
+def jwt_claims(token):
+    """
+    Return the claims of a JWT as a dict, or {} if the token cannot be
+    decoded. The signature is not verified.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else {}
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return {}
+
+def jwt_expiry(token):
+    """
+    Return the `exp` claim of a JWT as a unix timestamp, or None if the
+    token cannot be decoded. The signature is not verified.
+    """
+    try:
+        return float(jwt_claims(token)["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def is_expiring(token):
+    """
+    True if `token` expires within REFRESH_MARGIN seconds. Short-lived
+    tokens use half their lifetime as the margin instead, so a token is
+    never considered expiring as soon as it is issued.
+    """
+    claims = jwt_claims(token)
+    try:
+        expires = float(claims["exp"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    margin = REFRESH_MARGIN
+    try:
+        margin = min(margin, (expires - float(claims["iat"])) / 2)
+    except (KeyError, TypeError, ValueError):
+        pass
+    return expires - margin <= time.time()
+
+def _load():
+    """Load the token file once per process."""
+    global _tokens
+    with _lock:
+        if _tokens is None:
+            try:
+                with open(TOKEN_FILE, "r") as f:
+                    _tokens = json.load(f)
+            except (FileNotFoundError, ValueError):
+                _tokens = {}
+    return _tokens
+
+def _save():
+    """Atomically rewrite the token file."""
+    with _lock:
+        tmp_path = f"{TOKEN_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(_load(), f)
+        os.replace(tmp_path, TOKEN_FILE)
+
+def cached_token(address):
+    """
+    Return the stored token for `address` unless it is missing or about
+    to expire (see is_expiring), else None.
+    """
+    entry = _load().get(address.lower())
+    if not entry or is_expiring(entry.get("token")):
+        return None
+    return entry.get("token")
+
+def address_for_token(token):
+    """Return the address whose stored token is `token`, or None."""
+    with _lock:
+        for address, entry in _load().items():
+            if entry.get("token") == token:
+                return address
+    return None
+
+def token_expiry(address):
+    """Return the stored expiry timestamp for `address`, or None."""
+    entry = _load().get(address.lower())
+    return entry.get("exp") if entry else None
+
+def save_token(address, token):
+    """Store `token` for `address` together with its decoded expiry."""
+    with _lock:
+        _load()[address.lower()] = {"token": token, "exp": jwt_expiry(token)}
+        _save()
+
+def forget_token(address):
+    """Remove any stored token for `address`."""
+    with _lock:
+        if _load().pop(address.lower(), None) is not None:
+            _save()
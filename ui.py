@@ -1,27 +1,27 @@
+import io
+import sys
 import time
 import random
 from datetime import datetime
 from colors import Colors, SmoothGradientGreens
 from effects import clear_screen, glitch_text
 
-# Rich imports for premium UI
+# Rich imports for premium UI. Heavier components (progress, tables,
+# columns, prompts) are imported inside the functions that draw them.
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
-from rich.columns import Columns
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-from rich.table import Table
-from rich.layout import Layout
-from rich.live import Live
-from rich.prompt import Prompt, Confirm
 from rich import box
-from rich.padding import Padding
-from rich.rule import Rule
 
 # Initialize Rich console
 console = Console()
 
+# Stands in for the clock in the cached menu frame; same width as HH:MM:SS
+CLOCK_PLACEHOLDER = "--:--:--"
+# Terminal width -> pre-rendered logo + main menu (ANSI text)
+_menu_frames = {}
+
 def cyberpunk_separator(length=90, style="═"):
     """
     Return a full-width separator line in bright red.
@@ -33,6 +33,8 @@ def display_logo():
     Clear the screen and draw the full cyberpunk ASCII art logo,
     complete with glitch and drip effects, centered without a box.
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     clear_screen()
     
     # Create animated loading effect
@@ -48,6 +50,13 @@ def display_logo():
     
     console.clear()
     
+    draw_logo(console)
+
+def draw_logo(target):
+    """
+    Print the ASCII art logo, drip line and subtitle to the Rich console
+    `target`, centered without a box.
+    """
     # Enhanced logo with Rich styling
     logo_text = Text()
     logo_lines = [
@@ -76,7 +85,7 @@ def display_logo():
     colors = ["#00ff41", "#00e639", "#00cc31", "#00b329", "#009921", "#008019", "#006611", "#004d09"]
     
     # Print logo centered without any box or panel
-    console.print(Align.center(Text("\n".join(logo_lines), style="bold green")))
+    target.print(Align.center(Text("\n".join(logo_lines), style="bold green")))
     
     # Animated drip effect using Rich
     drip_chars = []
@@ -90,8 +99,8 @@ def display_logo():
     for char in drip_chars:
         drip_line.append(char)
     
-    console.print(Align.center(drip_line))
-    console.print()
+    target.print(Align.center(drip_line))
+    target.print()
     
     # Premium subtitle with gradient effect
     subtitle = Text()
@@ -103,27 +112,28 @@ def display_logo():
     subtitle.append("GENERATOR", style="bold green blink")
     subtitle.append("]", style="bright_black")
     
-    console.print(Align.center(subtitle))
-    console.print()
-    console.print()
+    target.print(Align.center(subtitle))
+    target.print()
+    target.print()
 
-def display_main_menu():
+def draw_main_menu(target):
     """
-    Clear screen, re-draw logo, then print a cyberpunk-styled main menu with Rich enhancements.
+    Print the cyberpunk-styled main menu tables and info bar to `target`,
+    with CLOCK_PLACEHOLDER where the current time goes.
     """
-    display_logo()
-    
-    # Get console width dynamically
-    console_width = console.width
+    from rich.table import Table
+    from rich.columns import Columns
+    from rich.padding import Padding
+
+    console_width = target.width
     
     # Create system status table
     status_table = Table(show_header=False, box=box.ROUNDED, style="cyan", width=37)
     status_table.add_column("", style="bright_white", width=20)
     status_table.add_column("", style="bright_cyan", width=17)
     
-    now = datetime.now().strftime("%H:%M:%S")
     status_table.add_row("⚡ STATUS  ", "[bold green]ONLINE")
-    status_table.add_row("🕒 TIME    ", f"[bold cyan]{now}")
+    status_table.add_row("🕒 TIME    ", f"[bold cyan]{CLOCK_PLACEHOLDER}")
     status_table.add_row("🔒 SECURITY", "[bold green]ENCRYPTED")
     status_table.add_row("🌐 NETWORK ", "[bold yellow]PROXY ACTIVE")
     
@@ -150,6 +160,10 @@ def display_main_menu():
         ("04", "ACCESS NODES", "SYNCED", "AWAIT"),
         ("05", "SYSTEM INFO", "ONLINE", "PUBLIC"),
         ("06", "TERMINATE SESSION", "ARMED", "DANGER"),
+        ("07", "INBOX MONITOR", "LIVE", "AWAIT"),
+        ("08", "MESSAGE SEARCH", "INDEXED", "SECURED"),
+        ("09", "API DIAGNOSTICS", "METERED", "PUBLIC"),
+        ("10", "ARCHIVE EXPORT", "STREAMING", "SECURED"),
     ]
     
     for code, operation, status, access in options:
@@ -168,10 +182,9 @@ def display_main_menu():
             f"[bold green]{status}[/]",
             f"[{access_color}]{access}[/]"
         )
-        time.sleep(0.1)  # Smooth menu loading
     
     # Create columns layout with proper padding
-    console.print(
+    target.print(
         Columns(
             [
                 Padding(status_table, (0, 1, 0, 1)),
@@ -182,11 +195,11 @@ def display_main_menu():
         ),
         justify="center"
     )
-    print("\n")
+    target.print("\n")
 
     # Add glitch effect separator using full console width
     separator = Text("█" * console_width, style="bold green")
-    console.print(separator)
+    target.print(separator)
     
     # System information bar
     info_text = Text()
@@ -199,13 +212,45 @@ def display_main_menu():
     info_text.append("ENCRYPTION: ", style="bright_black")
     info_text.append("AES-256", style="bold cyan")
 
-    console.print(Align.center(info_text))
-    console.print(Text("█" * console_width, style="bold green"))
+    target.print(Align.center(info_text))
+    target.print(Text("█" * console_width, style="bold green"))
+
+def render_menu_frame(width):
+    """
+    Render logo and main menu once for a terminal `width` into a string
+    of ANSI text, using the main console's color settings.
+    """
+    frame_console = Console(
+        file=io.StringIO(),
+        width=width,
+        force_terminal=console.is_terminal,
+        color_system=console.color_system,
+    )
+    draw_logo(frame_console)
+    draw_main_menu(frame_console)
+    return frame_console.file.getvalue()
+
+def display_main_menu():
+    """
+    Clear the screen and draw logo and main menu from the cached frame,
+    patching in the current time. The frame is rebuilt when the terminal
+    width changes.
+    """
+    width = console.width
+    frame = _menu_frames.get(width)
+    if frame is None:
+        _menu_frames.clear()
+        frame = _menu_frames[width] = render_menu_frame(width)
+    clear_screen()
+    sys.stdout.write(frame.replace(CLOCK_PLACEHOLDER, datetime.now().strftime("%H:%M:%S"), 1))
+    sys.stdout.flush()
 
 def cyberpunk_input_prompt(message, color=Colors.BRIGHT_CYAN):
     """
     Prompt the user in a styled bracket-arrow format using Rich.
     """
+    from rich.prompt import Prompt
+
     # Convert color to Rich style
     rich_color = "bright_cyan"
     if color == Colors.BRIGHT_RED:
@@ -257,6 +302,8 @@ def cyberpunk_footer():
     """
     Print a timestamp+status footer matching the header style using Rich.
     """
+    from rich.table import Table
+
     now = datetime.now().strftime("%H:%M:%S")
     
     # Create footer table
@@ -291,6 +338,8 @@ def show_loading_animation(message="Processing", duration=2):
     """
     Show a premium loading animation with spinner and progress bar.
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+
     with Progress(
         SpinnerColumn(spinner_style="cyan"),
         TextColumn(f"[bold cyan]{message}..."),